@@ -0,0 +1,185 @@
+"""
+Throughput benchmarks for the core paths of roulette.py.
+
+Measures BinBuilder.buildbins, Wheel.choose, Wheel.getOutcome, Table.isValid and
+Game.cycle at several table sizes, reporting rates, build time and peak memory.
+Results can be saved as a JSON baseline and later runs compared against it.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/bench_roulette.py --output baseline.json
+    PYTHONPATH=src python benchmarks/bench_roulette.py --compare baseline.json --threshold 0.1
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from roulette import Bet, BinBuilder, Game, Table, Wheel
+
+TABLE_SIZES = (1, 10, 100, 1000)
+
+# Metrics where a larger number is better; every other metric is a time or a size
+HIGHER_IS_BETTER = ("per_sec",)
+
+
+class FixedPlayer:
+    """
+    Player whose bets are placed once up front and stay on the table
+    """
+    def __init__(self, table: Table) -> None:
+        self.table = table
+
+    def placeBets(self) -> None:
+        pass
+
+    def win(self, bet: Bet) -> None:
+        pass
+
+    def lose(self, bet: Bet) -> None:
+        pass
+
+
+def best(func, number: int, repeat: int) -> float:
+    """
+
+    :param func: callable to time, called number times per repeat
+    :param number: calls per repeat
+    :param repeat: number of repeats
+    :return: fastest time of one call in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return min(times)
+
+
+def peakMemory(func) -> int:
+    """
+
+    :param func: callable to measure
+    :return: peak bytes allocated while it runs
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def built() -> Wheel:
+    wheel = Wheel()
+    BinBuilder(wheel).buildbins()
+    return wheel
+
+
+def tableOf(wheel: Wheel, size: int) -> Table:
+    """
+
+    :param wheel: built wheel
+    :param size: number of bets
+    :return: table with size bets spread over every outcome of the wheel
+    """
+    outcomes = list(wheel.all_outcomes.values())
+    return Table(*(Bet(5, outcomes[i % len(outcomes)]) for i in range(size)))
+
+
+def run(repeat: int = 5) -> dict:
+    """
+
+    :param repeat: repeats per measurement, the best is kept
+    :return: dict of benchmark name to dict of metric name to value
+    """
+    results = {}
+    results["buildbins"] = {
+        "seconds": best(built, 20, repeat),
+        "peak_bytes": peakMemory(built),
+    }
+
+    wheel = built()
+    wheel.rng.seed(1)
+    results["choose"] = {"spins_per_sec": 1 / best(wheel.choose, 10000, repeat)}
+
+    names = list(wheel.all_outcomes)
+    lookups = [lambda name=name: wheel.getOutcome(name) for name in names]
+    per_lookup = best(lambda: [f() for f in lookups], 100, repeat) / len(names)
+    results["getOutcome"] = {"lookups_per_sec": 1 / per_lookup}
+
+    for size in TABLE_SIZES:
+        table = tableOf(wheel, size)
+        table.limit = 10 ** 9
+        table.minimum = 1
+        results[f"isValid[{size}]"] = {"calls_per_sec": 1 / best(table.isValid, 1000, repeat)}
+
+        game = Game(table, wheel)
+        player = FixedPlayer(table)
+        number = max(10, 20000 // size)
+        per_spin = best(lambda: game.cycle(player), number, repeat)
+        results[f"cycle[{size}]"] = {
+            "spins_per_sec": 1 / per_spin,
+            "bets_settled_per_sec": size / per_spin,
+            "peak_bytes": peakMemory(lambda: [game.cycle(player) for _ in range(100)]),
+        }
+    return results
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+
+    :param baseline: results loaded from a baseline file
+    :param current: results of this run
+    :param threshold: allowed relative change in the bad direction, 0.1 is 10%
+    :return: list of (benchmark, metric, baseline value, current value, relative change)
+        for every metric that got worse by more than threshold
+    """
+    regressions = []
+    for name, metrics in current.items():
+        for metric, value in metrics.items():
+            old = baseline.get(name, {}).get(metric)
+            if not old:
+                continue
+            change = (value - old) / old
+            worse = -change if metric.endswith(HIGHER_IS_BETTER) else change
+            if worse > threshold:
+                regressions.append((name, metric, old, value, change))
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative change counted as a regression (default 0.1)")
+    parser.add_argument("--repeat", type=int, default=5, help="repeats per measurement")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    for name, metrics in results.items():
+        line = ", ".join(f"{metric}={value:.6g}" for metric, value in metrics.items())
+        print(f"{name:16s} {line}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        for name, metric, old, new, change in regressions:
+            print(f"REGRESSION {name} {metric}: {old:.6g} -> {new:.6g} ({change:+.1%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Compares the cost of getting a ready-to-spin American wheel:
+building it with BinBuilder, building it in one pass from the AMERICAN layout, loading a
+saved layout, and sharing the cached frozen wheel. Also reports the memory allocated by
+each builder for one wheel.
+
+Run from the repository root with: PYTHONPATH=src python benchmarks/bench_startup.py
+"""
+
+import os
+import tempfile
+import timeit
+import tracemalloc
+
+from roulette import AMERICAN, BinBuilder, Wheel, americanWheel
+
+
+def build() -> Wheel:
+    wheel = Wheel()
+    BinBuilder(wheel).buildbins()
+    return wheel
+
+
+def allocated(factory) -> tuple:
+    """
+
+    :param factory: callable building a wheel
+    :return: (bytes still held by the wheel, peak bytes allocated while building it)
+    """
+    tracemalloc.start()
+    wheel = factory()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del wheel
+    return held, peak
+
+
+def main(number: int = 200) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "american.layout")
+        build().saveLayout(path)
+        americanWheel()
+        timings = {
+            "BinBuilder.buildbins": timeit.timeit(build, number=number),
+            "Wheel.fromLayout": timeit.timeit(lambda: Wheel.fromLayout(AMERICAN), number=number),
+            "Wheel.loadLayout": timeit.timeit(lambda: Wheel.loadLayout(path), number=number),
+            "americanWheel (cached)": timeit.timeit(americanWheel, number=number),
+        }
+        size = os.path.getsize(path)
+    base = timings["BinBuilder.buildbins"]
+    print(f"layout file: {size:d} bytes")
+    for name, total in timings.items():
+        per_call = total / number * 1e6
+        print(f"{name:24s} {per_call:10.1f} us/wheel  {base / total:8.1f}x")
+    for name, factory in (("BinBuilder.buildbins", build),
+                          ("Wheel.fromLayout", lambda: Wheel.fromLayout(AMERICAN))):
+        held, peak = allocated(factory)
+        print(f"{name:24s} {held / 1024:10.1f} KiB held  {peak / 1024:8.1f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Simulations that stop on their own once the expected net result per spin is known
+closely enough.
+
+The mean and variance of the net result of each spin are kept with RunningStats and
+the run stops at the first check where the normal confidence interval for the mean
+is narrower than the requested tolerance, so short runs are used for low-variance
+bets and long runs only where they are needed.
+"""
+
+from dataclasses import dataclass
+
+from events import EventSink, SettlementEvent
+from roulette import Game, Table, Wheel
+from stats import RunningStats
+
+
+@dataclass
+class AdaptiveResult:
+    """
+    Outcome of an adaptive run
+
+    stats: RunningStats of the net result of every spin played
+    confidence: confidence level of the interval
+    tolerance: requested half-width of the interval
+    converged: whether the interval got within tolerance before the spin limit
+    """
+    stats: RunningStats
+    confidence: float
+    tolerance: float
+    converged: bool
+
+    @property
+    def spins(self) -> int:
+        return self.stats.count
+
+    @property
+    def mean(self) -> float:
+        return self.stats.mean
+
+    @property
+    def halfWidth(self) -> float:
+        return self.stats.halfWidth(self.confidence)
+
+    def __str__(self) -> str:
+        state = "converged" if self.converged else "stopped at the spin limit"
+        return (f"{self.mean:.6g} ± {self.halfWidth:.3g} per spin "
+                f"({self.confidence:.0%} confidence) after {self.spins} spins, {state}")
+
+
+class _SpinNet(EventSink):
+    """
+    Sums the payouts of the bets settled on the current spin
+    """
+    def __init__(self) -> None:
+        self.net = 0.0
+
+    def emit(self, event: SettlementEvent) -> None:
+        self.net += event.payout
+
+
+def _done(stats: RunningStats, tolerance: float, confidence: float, min_spins: int) -> bool:
+    return stats.count >= min_spins and stats.halfWidth(confidence) <= tolerance
+
+
+class AdaptiveSimulation:
+    """
+    One player playing spin after spin until the expected net result per spin is
+    known to within a tolerance
+
+    game: the Game being played
+    player: the player; its bets are taken off the table after each spin
+    stats: RunningStats of the net result of each spin
+    """
+    game: Game
+    player: object
+    stats: RunningStats
+
+    def __init__(self, wheel: Wheel, player) -> None:
+        """
+
+        :param wheel: wheel to play on
+        :param player: player with a table of its own, such as Passenger57; bet batches
+            on its table are not counted
+        """
+        self._net = _SpinNet()
+        self.game = Game(player.table, wheel, self._net)
+        self.player = player
+        self.stats = RunningStats()
+
+    def run(self, tolerance: float, confidence: float = 0.95, min_spins: int = 1000,
+            max_spins: int = 10_000_000, check: int = 1000) -> AdaptiveResult:
+        """
+        Plays until the confidence interval for the mean net result per spin has a
+        half-width of at most tolerance, or max_spins spins have been played in total
+
+        :param tolerance: largest acceptable half-width, in the same units as the bets
+        :param confidence: confidence level of the interval
+        :param min_spins: spins played before stopping is considered, so the variance
+            estimate has settled
+        :param max_spins: limit on the total number of spins
+        :param check: spins between checks of the interval
+        :return: AdaptiveResult with the spins used and the estimate
+        """
+        game, player, stats, spin = self.game, self.player, self.stats, self._net
+        while stats.count < max_spins:
+            spin.net = 0.0
+            game.cycle(player)
+            player.table.clear()
+            stats.push(spin.net)
+            if stats.count % check == 0 and _done(stats, tolerance, confidence, min_spins):
+                return AdaptiveResult(stats, confidence, tolerance, True)
+        converged = _done(stats, tolerance, confidence, min_spins)
+        return AdaptiveResult(stats, confidence, tolerance, converged)
+
+
+def estimateTable(wheel: Wheel, table: Table, tolerance: float, confidence: float = 0.95,
+                  min_spins: int = 1000, max_spins: int = 100_000_000,
+                  block: int = 1 << 16) -> AdaptiveResult:
+    """
+    Adaptive run for the fixed bets on a table, spinning a block at a time with
+    batch.runBatch. Needs NumPy.
+
+    :param wheel: wheel to spin
+    :param table: bets to settle on every spin
+    :param tolerance: largest acceptable half-width of the interval
+    :param confidence: confidence level of the interval
+    :param min_spins: spins played before stopping is considered
+    :param max_spins: limit on the number of spins
+    :param block: spins per batch, the granularity of the stopping check
+    :return: AdaptiveResult with the spins used and the estimate
+    """
+    import batch
+    stats = RunningStats()
+    while stats.count < max_spins:
+        stats.extend(batch.runBatch(wheel, table, min(block, max_spins - stats.count)))
+        if _done(stats, tolerance, confidence, min_spins):
+            return AdaptiveResult(stats, confidence, tolerance, True)
+    return AdaptiveResult(stats, confidence, tolerance, False)
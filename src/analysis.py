@@ -0,0 +1,158 @@
+"""
+Exact evaluation of a table's bets without simulating spins.
+
+Every bin of a wheel is equally likely, so the net result of a spin takes one value
+per bin. From those values the exact single-spin distribution, expected value and
+variance follow directly, and the distribution of the total over k independent
+spins is the k-fold convolution of the single-spin distribution, done with an FFT
+over the lattice of reachable totals, or directly over the reachable totals when
+that lattice would be too fine to hold in memory.
+
+Float amounts are read as the decimal they print as, so a bet of 0.1 counts as
+exactly 1/10 rather than the nearest binary fraction.
+"""
+
+from fractions import Fraction
+import math
+
+import numpy as np
+
+MAX_LATTICE = 1 << 24
+
+
+def exact(value) -> Fraction:
+    """
+
+    :param value: int, float, Fraction or Decimal amount
+    :return: the amount as a Fraction; floats are taken at their shortest decimal repr
+    """
+    if isinstance(value, float):
+        return Fraction(repr(value))
+    return Fraction(value)
+
+
+class TableEvaluator:
+    """
+    Exact payout distribution of a fixed set of bets on a wheel
+
+    nets: net result of the bets for each bin of the wheel, as Fractions
+    """
+    nets: tuple
+
+    def __init__(self, table, wheel) -> None:
+        """
+
+        :param table: Table (or any iterable of Bet) whose bets stay the same every spin
+        :param wheel: Wheel the bets are settled against
+        """
+        bets = list(table)
+        amounts = [exact(bet.amountBet) for bet in bets]
+        self.nets = tuple(
+            sum((amount * bet.outcome.odds if wbin.hasOutcome(bet.outcome) else -amount
+                 for bet, amount in zip(bets, amounts)), Fraction(0))
+            for wbin in wheel.bins)
+
+    def distribution(self) -> dict:
+        """
+
+        :return: dict mapping each possible net result of one spin to its exact probability
+        """
+        weight = Fraction(1, len(self.nets))
+        dist = {}
+        for net in self.nets:
+            dist[net] = dist.get(net, 0) + weight
+        return dict(sorted(dist.items()))
+
+    def expectedValue(self) -> Fraction:
+        """
+
+        :return: exact expected net result of one spin
+        """
+        return sum(self.nets, Fraction(0)) / len(self.nets)
+
+    def variance(self) -> Fraction:
+        """
+
+        :return: exact variance of the net result of one spin
+        """
+        mean = self.expectedValue()
+        return sum(((net - mean) ** 2 for net in self.nets), Fraction(0)) / len(self.nets)
+
+    def sessionDistribution(self, spins: int) -> tuple:
+        """
+        Distribution of the total net result over independent spins of the same bets
+
+        :param spins: number of spins
+        :return: (values, probabilities) NumPy arrays; values are every total the lattice of
+            single-spin results can reach, in increasing order, and probabilities sum to 1.
+            When the lattice would have more than MAX_LATTICE points only the reachable
+            totals are listed
+        """
+        low = min(self.nets)
+        steps = [net - low for net in self.nets]
+        step = _latticeStep(steps)
+        if step == 0:
+            return np.array([float(low * spins)]), np.array([1.0])
+        index = [int(s / step) for s in steps]
+        if max(index) * spins >= MAX_LATTICE:
+            return self._sparseSession(spins)
+        single = np.bincount(index).astype(np.float64) / len(self.nets)
+        length = (len(single) - 1) * spins + 1
+        size = 1 << (length - 1).bit_length()
+        probabilities = np.fft.irfft(np.fft.rfft(single, size) ** spins, size)[:length]
+        np.clip(probabilities, 0, None, out=probabilities)
+        probabilities /= probabilities.sum()
+        values = float(low) * spins + float(step) * np.arange(length)
+        return values, probabilities
+
+    def _sparseSession(self, spins: int) -> tuple:
+        """
+        k-fold convolution by repeated squaring over the reachable totals only
+
+        :param spins: number of spins
+        :return: (values, probabilities) as for sessionDistribution
+        """
+        single = {}
+        for net in self.nets:
+            single[net] = single.get(net, 0.0) + 1 / len(self.nets)
+        total, power = {Fraction(0): 1.0}, single
+        while spins:
+            if spins & 1:
+                total = _convolve(total, power)
+            spins >>= 1
+            if spins:
+                power = _convolve(power, power)
+        values = sorted(total)
+        return (np.array([float(v) for v in values]),
+                np.array([total[v] for v in values]))
+
+
+def _convolve(a: dict, b: dict) -> dict:
+    """
+
+    :param a: dict of value to probability
+    :param b: dict of value to probability
+    :return: distribution of the sum of independent draws from a and b
+    """
+    if len(a) * len(b) > MAX_LATTICE:
+        raise ValueError("session distribution has too many distinct totals to compute")
+    out = {}
+    for x, p in a.items():
+        for y, q in b.items():
+            out[x + y] = out.get(x + y, 0.0) + p * q
+    return out
+
+
+def _latticeStep(values: list) -> Fraction:
+    """
+
+    :param values: non-negative Fractions
+    :return: largest Fraction that every value is a whole multiple of, 0 if all are 0
+    """
+    denominator = 1
+    for v in values:
+        denominator = denominator * v.denominator // math.gcd(denominator, v.denominator)
+    numerator = 0
+    for v in values:
+        numerator = math.gcd(numerator, v.numerator * (denominator // v.denominator))
+    return Fraction(numerator, denominator)
@@ -0,0 +1,80 @@
+"""
+Vectorized settlement of many spins at once.
+
+A Game normally spins and settles one bet at a time through Outcome and Bin
+objects. For a fixed set of bets the net result of each bin never changes, so
+the batch engine reduces the table to one net value per bin using an
+outcome-membership matrix and then settles every spin with a single lookup.
+"""
+
+import numpy as np
+
+
+def membershipMatrix(wheel) -> tuple:
+    """
+
+    :param wheel: Wheel whose bins have been filled (usually by BinBuilder.buildbins)
+    :return: (matrix, columns) where matrix is a boolean array of shape (bins, outcomes) and
+        columns maps each Outcome to its column, which is its interned id. matrix[i, columns[o]]
+        is True when outcome o is in wheel.bins[i]
+    """
+    count = len(wheel.outcomes_by_id)
+    width = (count + 7) // 8
+    packed = np.frombuffer(wheel.packedMasks(), dtype=np.uint8).reshape(len(wheel.bins), width)
+    matrix = np.unpackbits(packed, axis=1, count=count, bitorder="little").astype(bool)
+    return matrix, wheel.outcome_ids
+
+
+def binPayouts(wheel, bets) -> np.ndarray:
+    """
+
+    :param wheel: Wheel the bets are settled against
+    :param bets: iterable of Bet objects, or a Table, whose cached payout vector (bet
+        batches included) is used as is
+    :return: float array with one entry per bin, the net result of all bets if that bin wins.
+        A winning bet nets winAmount() - loseAmount(), a losing bet nets -loseAmount()
+    """
+    payouts = getattr(bets, "payouts", None)
+    if payouts is not None:
+        return np.array(payouts(wheel), dtype=np.float64)
+    bets = list(bets)
+    matrix, columns = membershipMatrix(wheel)
+    payouts = np.zeros(len(wheel.bins), dtype=np.float64)
+    if not bets:
+        return payouts
+    cols = np.array([columns.get(bet.outcome, -1) for bet in bets], dtype=np.intp)
+    wins = np.array([bet.winAmount() - bet.loseAmount() for bet in bets], dtype=np.float64)
+    loses = np.array([bet.loseAmount() for bet in bets], dtype=np.float64)
+    hits = np.zeros((len(wheel.bins), len(bets)), dtype=bool)
+    known = cols >= 0
+    hits[:, known] = matrix[:, cols[known]]
+    payouts = np.where(hits, wins, -loses).sum(axis=1)
+    return payouts
+
+
+def drawIndices(wheel, spins: int) -> np.ndarray:
+    """
+
+    :param wheel: Wheel whose rng is used for the draw
+    :param spins: number of spins to draw
+    :return: int array of bin indices. The rng is consumed exactly as repeated calls to
+        wheel.choose() would, so the same seed produces the same bins as Game.cycle
+    """
+    indices = getattr(wheel.rng, "indices", None)
+    if indices is not None:
+        return indices(len(wheel.bins), spins)
+    choice = wheel.rng.choice
+    positions = range(len(wheel.bins))
+    return np.fromiter((choice(positions) for _ in range(spins)), dtype=np.intp, count=spins)
+
+
+def runBatch(wheel, bets, spins: int) -> np.ndarray:
+    """
+
+    :param wheel: Wheel to spin
+    :param bets: iterable of Bet objects that stay on the table for every spin
+    :param spins: number of spins
+    :return: float array of length spins with the net result of each spin
+    """
+    payouts = binPayouts(wheel, bets)
+    return payouts[drawIndices(wheel, spins)]
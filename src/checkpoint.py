@@ -0,0 +1,166 @@
+"""
+Checkpoint and resume for long simulations.
+
+A Simulation plays a player against a Game and can snapshot itself to disk: the
+wheel's rng state, the player (with its table and any state of its own), the
+spin count and the statistics gathered so far. The wheel's layout is not written;
+references to the wheel, its bins and its interned outcomes are stored as ids and
+reconnected to the wheel given when resuming, which must have the same layout.
+Snapshots are written to a temporary file and renamed over the old one, so a crash
+while writing never leaves a damaged checkpoint.
+"""
+
+import io
+import os
+import pickle
+import tempfile
+import time
+
+from events import AggregatingSink
+from roulette import Bin, Game, Outcome, Wheel
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def __init__(self, file, wheel: Wheel) -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.wheel = wheel
+
+    def persistent_id(self, obj):
+        if obj is self.wheel:
+            return ("wheel",)
+        if isinstance(obj, Bin) and obj.index is not None and self.wheel.bins[obj.index] is obj:
+            return ("bin", obj.index)
+        if isinstance(obj, Outcome) and obj.id is not None \
+                and obj.id < len(self.wheel.outcomes_by_id) \
+                and self.wheel.outcomes_by_id[obj.id] is obj:
+            return ("outcome", obj.id)
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, wheel: Wheel) -> None:
+        super().__init__(file)
+        self.wheel = wheel
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == "wheel":
+            return self.wheel
+        if kind == "bin":
+            return self.wheel.bins[pid[1]]
+        if kind == "outcome":
+            return self.wheel.outcomes_by_id[pid[1]]
+        raise pickle.UnpicklingError(f"unknown reference {pid!r}")
+
+
+class Simulation:
+    """
+    One player playing spin after spin, with statistics and checkpoints
+
+    game: the Game being played
+    player: the player; its bets are taken off the table after each spin
+    stats: AggregatingSink with the totals of every settled bet
+    """
+    game: Game
+    player: object
+    stats: AggregatingSink
+
+    VERSION = 1
+
+    def __init__(self, wheel: Wheel, player) -> None:
+        """
+
+        :param wheel: wheel to play on
+        :param player: player with a table of its own, such as Passenger57
+        """
+        self.stats = AggregatingSink()
+        self.game = Game(player.table, wheel, self.stats)
+        self.player = player
+
+    def run(self, spins: int, path: str = None, interval: float = 5.0) -> None:
+        """
+        Plays until the game has played spins spins in total
+
+        :param spins: total number of spins, counting any already played before a resume
+        :param path: checkpoint file; written every interval seconds and at the end
+        :param interval: seconds between checkpoints
+        :return:
+        """
+        game, player = self.game, self.player
+        clock = time.monotonic
+        due = clock() + interval
+        while game.spins < spins:
+            game.cycle(player)
+            player.table.clear()
+            if path is not None and clock() >= due:
+                self.save(path)
+                due = clock() + interval
+        if path is not None:
+            self.save(path)
+
+    def snapshot(self) -> bytes:
+        """
+
+        :return: the simulation's state as bytes
+        """
+        wheel = self.game.wheel
+        buffer = io.BytesIO()
+        _SnapshotPickler(buffer, wheel).dump({
+            "version": self.VERSION,
+            "rng": wheel.rng.getstate(),
+            "spins": self.game.spins,
+            "player": self.player,
+            "stats": self.stats,
+        })
+        return buffer.getvalue()
+
+    def save(self, path: str) -> None:
+        """
+        Atomically replaces path with a snapshot
+
+        :param path: checkpoint file
+        :return:
+        """
+        data = self.snapshot()
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp = tempfile.mkstemp(prefix=".checkpoint-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    @classmethod
+    def restore(cls, data: bytes, wheel: Wheel) -> "Simulation":
+        """
+
+        :param data: bytes from snapshot
+        :param wheel: wheel with the same layout as the one the snapshot was taken on; its
+            rng is set to the saved state
+        :return: Simulation that continues exactly where the snapshot was taken
+        """
+        state = _SnapshotUnpickler(io.BytesIO(data), wheel).load()
+        if state["version"] != cls.VERSION:
+            raise ValueError(f"unsupported checkpoint version {state['version']!r}")
+        simulation = cls.__new__(cls)
+        simulation.player = state["player"]
+        simulation.stats = state["stats"]
+        simulation.game = Game(simulation.player.table, wheel, simulation.stats)
+        simulation.game.spins = state["spins"]
+        wheel.rng.setstate(state["rng"])
+        return simulation
+
+    @classmethod
+    def resume(cls, path: str, wheel: Wheel) -> "Simulation":
+        """
+
+        :param path: checkpoint file written by save
+        :param wheel: wheel with the same layout as the saved one
+        :return: the restored Simulation
+        """
+        with open(path, "rb") as f:
+            return cls.restore(f.read(), wheel)
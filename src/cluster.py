@@ -0,0 +1,245 @@
+"""
+Runs one long simulation split into shards over worker processes on any number of hosts.
+
+The coordinator cuts the run into shards of consecutive spins. Shard i is played
+on a freshly built American wheel seeded with runner.sessionSeed(seed, i), so its
+result depends only on the master seed and the shard bounds. Workers connect to the
+coordinator over a multiprocessing.connection socket, ask for shards, report partial
+totals while they play and send the shard's totals when it is done. A worker whose
+connection drops loses its unfinished shard, which goes back to the front of the
+queue for the next free worker. The totals are merged in shard order once every
+shard is in, so the report is the same however the shards were spread.
+
+Workers on other hosts are started with
+
+    ROULETTE_CLUSTER_KEY=<hex authkey> python src/cluster.py <host> <port>
+"""
+
+import collections
+import dataclasses
+import os
+import queue
+import subprocess
+import sys
+import threading
+from multiprocessing.connection import Client, Listener, wait
+
+from roulette import BinBuilder, Game, Table, Wheel
+from runner import CountingPassenger57, SessionStats, sessionSeed
+
+KEY_VARIABLE = "ROULETTE_CLUSTER_KEY"
+
+
+def shardBounds(spins: int, shard: int) -> list:
+    """
+
+    :param spins: spins in the whole run
+    :param shard: spins per shard
+    :return: list of (start, stop) spin ranges, the last one possibly shorter
+    """
+    return [(start, min(start + shard, spins)) for start in range(0, spins, shard)]
+
+
+def playShard(wheel: Wheel, seed: int, index: int, start: int, stop: int,
+              report: int = None, progress=None) -> SessionStats:
+    """
+    Plays spins start..stop-1 as one Passenger57 session on a wheel seeded for the shard
+
+    :param wheel: built wheel; its rng is reseeded
+    :param seed: master seed of the run
+    :param index: shard number, from which the shard's seed is derived
+    :param start: first spin of the shard
+    :param stop: spin to stop before
+    :param report: spins between calls to progress
+    :param progress: called with the shard's stats so far every report spins
+    :return: stats of the shard, counted as one session
+    """
+    wheel.rng.seed(sessionSeed(seed, index))
+    stats = SessionStats()
+    table = Table()
+    player = CountingPassenger57(table, wheel, stats)
+    game = Game(table, wheel)
+    for _ in range(start, stop):
+        game.cycle(player)
+        table.clear()
+        stats.spins += 1
+        if progress is not None and stats.spins % report == 0:
+            progress(stats)
+    stats.sessions = 1
+    return stats
+
+
+def work(address: tuple, authkey: bytes, report: int = 100_000) -> None:
+    """
+    Worker loop: plays the shards the coordinator hands out until told to stop
+
+    :param address: (host, port) of the coordinator
+    :param authkey: key shared with the coordinator
+    :param report: spins between partial reports
+    :return:
+    """
+    wheel = Wheel()
+    BinBuilder(wheel).buildbins()
+    with Client(address, authkey=authkey) as conn:
+        conn.send(("hello", os.getpid()))
+        try:
+            while True:
+                message = conn.recv()
+                if message[0] == "stop":
+                    return
+                _, index, start, stop, seed = message
+                stats = playShard(wheel, seed, index, start, stop, report,
+                                  lambda s: conn.send(("partial", index, dataclasses.replace(s))))
+                conn.send(("done", index, stats))
+        except (EOFError, OSError):
+            return
+
+
+class Coordinator:
+    """
+    Hands out shards of a run to workers and merges their results
+
+    address: (host, port) the coordinator listens on
+    authkey: key workers must present
+    bounds: (start, stop) spin range of every shard
+    results: stats of every finished shard, None until it is in
+    partials: latest partial stats of every shard in progress
+    reassigned: number of shards handed out again after their worker went away
+    """
+    address: tuple
+    authkey: bytes
+    bounds: list
+    results: list
+    partials: dict
+    reassigned: int
+
+    def __init__(self, spins: int, seed: int, shard: int = 1_000_000,
+                 address: tuple = ("localhost", 0), authkey: bytes = None) -> None:
+        """
+
+        :param spins: spins in the whole run
+        :param seed: master seed; the same seed and shard size always give the same report
+        :param shard: spins per shard
+        :param address: address to listen on; port 0 picks a free port, use a public
+            interface to accept workers from other hosts
+        :param authkey: key shared with the workers, random by default
+        """
+        self.seed = seed
+        self.bounds = shardBounds(spins, shard)
+        self.results = [None] * len(self.bounds)
+        self.partials = {}
+        self.reassigned = 0
+        self.authkey = os.urandom(16) if authkey is None else authkey
+        self.listener = Listener(address, authkey=self.authkey)
+        self.address = self.listener.address
+        self._joined = queue.Queue()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                self._joined.put(self.listener.accept())
+            except OSError:
+                return
+            except Exception:
+                # a client that failed authentication; keep listening
+                continue
+
+    def spawnWorkers(self, count: int) -> list:
+        """
+        Starts workers as local subprocesses
+
+        :param count: number of workers
+        :return: list of the subprocess.Popen objects
+        """
+        env = dict(os.environ, **{KEY_VARIABLE: self.authkey.hex()})
+        host, port = self.address
+        return [subprocess.Popen([sys.executable, os.path.abspath(__file__), host, str(port)],
+                                 env=env)
+                for _ in range(count)]
+
+    def run(self, workers: int = 0) -> SessionStats:
+        """
+        Serves shards until every one has been played
+
+        :param workers: local worker subprocesses to start; other workers may connect too
+        :return: stats of every shard merged in shard order
+        """
+        processes = self.spawnWorkers(workers)
+        pending = collections.deque(i for i, r in enumerate(self.results) if r is None)
+        assigned, idle, conns = {}, collections.deque(), []
+
+        def dispatch(conn) -> None:
+            if pending:
+                index = pending.popleft()
+                start, stop = self.bounds[index]
+                try:
+                    conn.send(("shard", index, start, stop, self.seed))
+                except OSError:
+                    # the worker went away before the shard reached it
+                    pending.appendleft(index)
+                    drop(conn)
+                    return
+                assigned[conn] = index
+            else:
+                idle.append(conn)
+
+        def drop(conn) -> None:
+            conns.remove(conn)
+            if conn in idle:
+                idle.remove(conn)
+            index = assigned.pop(conn, None)
+            if index is not None and self.results[index] is None:
+                self.partials.pop(index, None)
+                pending.appendleft(index)
+                self.reassigned += 1
+                while pending and idle:
+                    dispatch(idle.popleft())
+            conn.close()
+
+        try:
+            while any(r is None for r in self.results):
+                while not self._joined.empty():
+                    conns.append(self._joined.get())
+                if processes and not conns and all(p.poll() is not None for p in processes):
+                    raise RuntimeError("every worker exited before the run finished")
+                for conn in wait(conns, timeout=0.05):
+                    if conn not in conns:
+                        # dropped while handling another worker's message
+                        continue
+                    try:
+                        kind, *body = conn.recv()
+                    except (EOFError, OSError):
+                        drop(conn)
+                        continue
+                    if kind == "hello":
+                        dispatch(conn)
+                    elif kind == "partial":
+                        self.partials[body[0]] = body[1]
+                    elif kind == "done":
+                        index, stats = body
+                        self.results[index] = stats
+                        self.partials.pop(index, None)
+                        del assigned[conn]
+                        dispatch(conn)
+            for conn in conns:
+                try:
+                    conn.send(("stop",))
+                except OSError:
+                    pass
+                conn.close()
+        finally:
+            self.listener.close()
+            for process in processes:
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        total = SessionStats()
+        for stats in self.results:
+            total.merge(stats)
+        return total
+
+
+if __name__ == "__main__":
+    work((sys.argv[1], int(sys.argv[2])), bytes.fromhex(os.environ[KEY_VARIABLE]))
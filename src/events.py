@@ -0,0 +1,189 @@
+"""
+Settlement events and the sinks a Game sends them to.
+
+Game.cycle emits one SettlementEvent per bet instead of the player printing its
+results. A sink decides what happens to them: drop them, aggregate them in memory,
+write them to a compact binary file or print them to the console. After every spin,
+whether or not any bet was settled on it, the game also calls the sink's endSpin
+with the spin's index and bin, for sinks that keep one record per spin.
+"""
+
+from dataclasses import dataclass
+import collections
+import struct
+
+
+@dataclass(frozen=True)
+class SettlementEvent:
+    """
+    Result of one bet on one spin
+
+    spin: index of the spin within the game
+    bin: index of the winning bin on the wheel
+    bet: the Bet that was settled
+    won: True if the bet's outcome was in the winning bin
+    payout: net result of the bet, winAmount() - loseAmount() for a win and
+        -loseAmount() for a loss
+    outcome_id: id of the bet's outcome on the game's wheel, -1 if the wheel does not
+        hold it
+    """
+    spin: int
+    bin: int
+    bet: object
+    won: bool
+    payout: float
+    outcome_id: int = -1
+
+
+class EventSink:
+    """
+    Receives settlement events from a Game
+
+    active: when False the game does not build events for this sink at all
+    """
+    active = True
+
+    def emit(self, event: SettlementEvent) -> None:
+        """
+
+        :param event: event to handle
+        :return:
+        """
+        raise NotImplementedError
+
+    def endSpin(self, spin: int, bin: int) -> None:
+        """
+        Called after the events of every spin, including spins without settled bets
+
+        :param spin: index of the spin within the game
+        :param bin: index of the bin the wheel landed on
+        :return:
+        """
+
+    def close(self) -> None:
+        """
+        Releases anything held by the sink
+
+        :return:
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class NullSink(EventSink):
+    """
+    Discards every event; games using it skip event creation entirely
+    """
+    active = False
+
+    def emit(self, event: SettlementEvent) -> None:
+        pass
+
+
+class AggregatingSink(EventSink):
+    """
+    Keeps running totals of the events it receives
+    """
+    events: int
+    wins: int
+    losses: int
+    wagered: float
+    net: float
+    bins: collections.Counter
+
+    def __init__(self) -> None:
+        self.events = 0
+        self.wins = 0
+        self.losses = 0
+        self.wagered = 0
+        self.net = 0
+        self.bins = collections.Counter()
+        self._last_spin = None
+
+    def emit(self, event: SettlementEvent) -> None:
+        self.events += 1
+        if event.won:
+            self.wins += 1
+        else:
+            self.losses += 1
+        self.wagered += event.bet.loseAmount()
+        self.net += event.payout
+        if event.spin != self._last_spin:
+            self._last_spin = event.spin
+            self.bins[event.bin] += 1
+
+
+class ConsoleSink(EventSink):
+    """
+    Prints each result the way Passenger57 used to
+    """
+    def emit(self, event: SettlementEvent) -> None:
+        if event.won:
+            print(str(event.bet) + " is a winner! You win $" + str(event.bet.winAmount()))
+        else:
+            print(str(event.bet) + " is a loser. You lose $" + str(event.bet.loseAmount()))
+
+
+class BufferedFileSink(EventSink):
+    """
+    Writes events as fixed-width little-endian binary records, gathered in memory and
+    written in large chunks.
+
+    Each record is RECORD: spin (uint64), bin (uint16), outcome id on the game's wheel
+    (int32, -1 if the wheel does not hold the outcome), won (uint8), amount bet
+    (float64) and payout (float64). Use readEvents to decode the file.
+    """
+    RECORD = struct.Struct("<QHiBdd")
+
+    def __init__(self, path: str, chunk: int = 1 << 20) -> None:
+        """
+
+        :param path: file to write, replaced if it exists
+        :param chunk: number of buffered bytes that triggers a write
+        """
+        self.file = open(path, "wb")
+        self.chunk = chunk
+        self.buffer = bytearray()
+
+    def emit(self, event: SettlementEvent) -> None:
+        self.buffer += self.RECORD.pack(event.spin, event.bin, event.outcome_id,
+                                        event.won, event.bet.amountBet, event.payout)
+        if len(self.buffer) >= self.chunk:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes out anything buffered
+
+        :return:
+        """
+        self.file.write(self.buffer)
+        self.buffer.clear()
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+def readEvents(path: str, chunk: int = 1 << 20):
+    """
+    Streams the records of a file written by BufferedFileSink
+
+    :param path: file to read
+    :param chunk: bytes read at a time, rounded down to whole records
+    :return: iterator of (spin, bin, outcome id, won, amount, payout) tuples
+    """
+    record = BufferedFileSink.RECORD
+    size = max(1, chunk // record.size) * record.size
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(size)
+            if not data:
+                break
+            for spin, wbin, oid, won, amount, payout in record.iter_unpack(data):
+                yield spin, wbin, oid, bool(won), amount, payout
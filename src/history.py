@@ -0,0 +1,218 @@
+"""
+Append-only store of which bin every spin landed on.
+
+Spins are written as fixed-width little-endian records after a 16 byte header: the
+bin index as one byte and, optionally, the net payout of the spin as a float64.
+SpinHistoryWriter gathers records in a NumPy buffer and writes them in large
+chunks; SpinHistory maps the file into memory, so ranges are zero-copy views and
+statistics over billions of spins are computed in bounded chunks without reading
+the whole file into RAM.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+from events import EventSink, SettlementEvent
+
+MAGIC = b"RSPH"
+VERSION = 1
+HEADER = struct.Struct("<4sBB10x")
+WITH_NET = 1
+
+BIN_ONLY = np.dtype("u1")
+BIN_AND_NET = np.dtype([("bin", "u1"), ("net", "<f8")])
+
+
+def _recordType(with_net: bool) -> np.dtype:
+    return BIN_AND_NET if with_net else BIN_ONLY
+
+
+def _readHeader(path: str) -> bool:
+    with open(path, "rb") as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a spin history file")
+    magic, version, flags = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} spin history file")
+    return bool(flags & WITH_NET)
+
+
+class SpinHistoryWriter:
+    """
+    Appends spins to a history file
+
+    with_net: whether records carry the net payout of each spin
+    """
+    with_net: bool
+
+    def __init__(self, path: str, with_net: bool = False, buffer: int = 1 << 20) -> None:
+        """
+
+        :param path: history file; an existing file is appended to and must have the same
+            with_net setting
+        :param with_net: store the net payout of each spin as well as its bin
+        :param buffer: number of spins held in memory between writes
+        """
+        if os.path.exists(path) and os.path.getsize(path):
+            if _readHeader(path) != with_net:
+                raise ValueError(f"{path} was written with with_net={not with_net}")
+            self.file = open(path, "ab")
+        else:
+            self.file = open(path, "wb")
+            self.file.write(HEADER.pack(MAGIC, VERSION, WITH_NET if with_net else 0))
+        self.with_net = with_net
+        self._buffer = np.zeros(buffer, dtype=_recordType(with_net))
+        self._used = 0
+
+    def append(self, bin_index: int, net: float = 0.0) -> None:
+        """
+
+        :param bin_index: index of the bin the spin landed on
+        :param net: net payout of the spin, ignored unless with_net
+        :return:
+        """
+        if self._used == len(self._buffer):
+            self.flush()
+        if self.with_net:
+            self._buffer[self._used] = (bin_index, net)
+        else:
+            self._buffer[self._used] = bin_index
+        self._used += 1
+
+    def extend(self, bins, nets=None) -> None:
+        """
+
+        :param bins: array of bin indices
+        :param nets: array of net payouts, same length as bins; required when with_net
+        :return:
+        """
+        bins = np.asarray(bins)
+        if self.with_net:
+            if nets is None or len(nets) != len(bins):
+                raise ValueError("nets must be given for every spin")
+            nets = np.asarray(nets, dtype=np.float64)
+        start = 0
+        while start < len(bins):
+            if self._used == len(self._buffer):
+                self.flush()
+            take = min(len(bins) - start, len(self._buffer) - self._used)
+            target = self._buffer[self._used:self._used + take]
+            if self.with_net:
+                target["bin"] = bins[start:start + take]
+                target["net"] = nets[start:start + take]
+            else:
+                target[:] = bins[start:start + take]
+            self._used += take
+            start += take
+
+    def flush(self) -> None:
+        """
+        Writes out the buffered spins
+
+        :return:
+        """
+        self.file.write(self._buffer[:self._used].tobytes())
+        self.file.flush()
+        self._used = 0
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class HistorySink(EventSink):
+    """
+    Event sink that records one history entry per spin, with the spin's summed payout.
+    Every spin the game plays is recorded, spins without bets with a payout of 0, so
+    entry n of the history is spin n of the game.
+    """
+    def __init__(self, writer: SpinHistoryWriter) -> None:
+        self.writer = writer
+        self._net = 0.0
+
+    def emit(self, event: SettlementEvent) -> None:
+        self._net += event.payout
+
+    def endSpin(self, spin: int, bin: int) -> None:
+        self.writer.append(bin, self._net)
+        self._net = 0.0
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class SpinHistory:
+    """
+    Read-only memory-mapped view of a history file
+
+    bins: array of the bin index of every spin, backed by the file
+    nets: array of net payouts backed by the file, None if the file has none
+    """
+    def __init__(self, path: str) -> None:
+        """
+
+        :param path: file written by SpinHistoryWriter
+        """
+        self.with_net = _readHeader(path)
+        dtype = _recordType(self.with_net)
+        count = (os.path.getsize(path) - HEADER.size) // dtype.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size,
+                                     shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=dtype)
+        self.bins = self.records["bin"] if self.with_net else self.records
+        self.nets = self.records["net"] if self.with_net else None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def range(self, start: int, stop: int) -> tuple:
+        """
+
+        :param start: first spin
+        :param stop: spin to stop before
+        :return: (bins, nets) views of the range without copying; nets is None if the
+            file has none
+        """
+        nets = None if self.nets is None else self.nets[start:stop]
+        return self.bins[start:stop], nets
+
+    def stats(self, start: int = 0, stop: int = None, bins: int = 38,
+              chunk: int = 1 << 24) -> dict:
+        """
+        Aggregates a range of spins a chunk at a time
+
+        :param start: first spin
+        :param stop: spin to stop before, defaults to the end
+        :param bins: number of bins on the wheel, the length of the counts
+        :param chunk: spins processed at a time
+        :return: dict with spins, counts (spins per bin) and, when the file has payouts,
+            net, mean, min and max of the net payout
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        counts = np.zeros(bins, dtype=np.int64)
+        net, low, high = 0.0, np.inf, -np.inf
+        for begin in range(start, stop, chunk):
+            end = min(begin + chunk, stop)
+            counts += np.bincount(self.bins[begin:end], minlength=bins)
+            if self.nets is not None:
+                part = np.asarray(self.nets[begin:end])
+                net += float(part.sum())
+                low = min(low, float(part.min()))
+                high = max(high, float(part.max()))
+        spins = max(stop - start, 0)
+        result = {"spins": spins, "counts": counts}
+        if self.nets is not None and spins:
+            result.update(net=net, mean=net / spins, min=low, max=high)
+        return result
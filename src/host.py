@@ -0,0 +1,197 @@
+"""
+Hosts many Game tables concurrently on one asyncio event loop.
+
+Each table runs its spins as its own task. Before a spin the host awaits every
+player's placeBets, which may be a coroutine waiting on an outside decision, with a
+timeout; a player that does not answer in time sits the spin out and is counted in
+the table's timeouts. A player whose placeBets raises sits the spin out as well and
+is counted in the table's errors, which keep the last exception. Settlement events go into a bounded
+queue drained by consumer coroutines, and a table waits when the queue is full, so
+slow consumers hold the tables back instead of letting events pile up in memory. A
+consumer that raises stops the run: the tables are cancelled and the error is raised
+from run, rather than leaving them waiting on a queue nobody drains.
+"""
+
+import asyncio
+from dataclasses import dataclass
+import inspect
+
+from events import EventSink, SettlementEvent
+from roulette import Bet, Game, Passenger57, Table, Wheel
+
+
+class _SpinCollector(EventSink):
+    """
+    Holds the events of one spin until the host can put them on its queue
+    """
+    def __init__(self) -> None:
+        self.events = []
+
+    def emit(self, event: SettlementEvent) -> None:
+        self.events.append(event)
+
+    def drain(self) -> list:
+        events, self.events = self.events, []
+        return events
+
+
+@dataclass
+class TableStats:
+    """
+    Counters for one hosted table
+
+    errors: placeBets calls that raised, other than timeouts
+    last_error: the most recent of those exceptions, None if there were none
+    """
+    spins: int = 0
+    bets: int = 0
+    timeouts: int = 0
+    net: float = 0
+    errors: int = 0
+    last_error: BaseException = None
+
+
+class LocalPlayer(Passenger57):
+    """
+    In-process stand-in for a remote player: it waits delay seconds, as if for an outside
+    decision, then bets amount on one outcome
+    """
+    delay: float
+    net: float
+
+    def __init__(self, table: Table, wheel: Wheel, delay: float = 0.0, outcome: str = "Black",
+                 amount: int = 5) -> None:
+        super().__init__(table, wheel)
+        self.delay = delay
+        self.outcome = wheel.getOutcome(outcome)
+        self.amount = amount
+        self.net = 0
+
+    async def placeBets(self) -> None:
+        await asyncio.sleep(self.delay)
+        self.table.placeBet(Bet(self.amount, self.outcome))
+
+    def win(self, bet: Bet) -> None:
+        self.net += bet.winAmount() - bet.loseAmount()
+
+    def lose(self, bet: Bet) -> None:
+        self.net -= bet.loseAmount()
+
+
+class AsyncGameHost:
+    """
+    Runs spins across many tables concurrently
+
+    games: hosted games, each with its players seated
+    stats: TableStats for each game, in the same order
+    """
+    games: list
+    stats: list
+
+    def __init__(self, timeout: float = 1.0, queue_size: int = 1000) -> None:
+        """
+
+        :param timeout: seconds a player's placeBets may take before it sits the spin out
+        :param queue_size: most settlement events waiting for consumers before tables pause
+        """
+        self.timeout = timeout
+        self.queue_size = queue_size
+        self.games = []
+        self.stats = []
+        self._collectors = []
+
+    def addTable(self, game: Game) -> None:
+        """
+
+        :param game: Game with its players seated; its event sink is replaced by the host
+        :return:
+        """
+        collector = _SpinCollector()
+        game.sink = collector
+        self.games.append(game)
+        self.stats.append(TableStats())
+        self._collectors.append(collector)
+
+    async def _placeBets(self, player, stats: TableStats) -> bool:
+        try:
+            result = player.placeBets()
+            if inspect.isawaitable(result):
+                await asyncio.wait_for(result, self.timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+        except Exception as error:
+            # a failing player only costs that player the spin
+            stats.errors += 1
+            stats.last_error = error
+        else:
+            return True
+        player.table.clear()
+        return False
+
+    async def _runTable(self, index: int, spins: int, queue: asyncio.Queue) -> None:
+        game = self.games[index]
+        stats = self.stats[index]
+        collector = self._collectors[index]
+        for _ in range(spins):
+            answered = await asyncio.gather(*(self._placeBets(p, stats) for p in game.players))
+            players = [p for p, ok in zip(game.players, answered) if ok]
+            game.resolve(players)
+            stats.spins += 1
+            for event in collector.drain():
+                stats.bets += 1
+                stats.net += event.payout
+                if queue is not None:
+                    await queue.put(event)
+            for p in players:
+                p.table.clear()
+
+    async def _consume(self, consumer, queue: asyncio.Queue) -> None:
+        while True:
+            event = await queue.get()
+            try:
+                result = consumer(event)
+                if inspect.isawaitable(result):
+                    await result
+            finally:
+                queue.task_done()
+
+    @staticmethod
+    async def _watch(tasks: list, workers: list) -> None:
+        """
+        Waits for tasks to finish, raising the first error of a task or of a consumer
+
+        :param tasks: tasks to wait for
+        :param workers: consumer tasks, which only finish by raising
+        :return:
+        """
+        pending = set(tasks)
+        while pending:
+            done, _ = await asyncio.wait(pending | set(workers),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+            pending -= done
+
+    async def run(self, spins: int, consumers=()) -> list:
+        """
+
+        :param spins: spins to play on every table
+        :param consumers: callables (plain or async) given each SettlementEvent; without
+            consumers events are only counted. If one raises, the tables are cancelled
+            and the error is raised here
+        :return: the TableStats of every table
+        """
+        queue = asyncio.Queue(self.queue_size) if consumers else None
+        workers = [asyncio.ensure_future(self._consume(c, queue)) for c in consumers]
+        tasks = [asyncio.ensure_future(self._runTable(i, spins, queue))
+                 for i in range(len(self.games))]
+        try:
+            await self._watch(tasks, workers)
+            if queue is not None:
+                tasks.append(asyncio.ensure_future(queue.join()))
+                await self._watch(tasks[-1:], workers)
+        finally:
+            for task in tasks + workers:
+                task.cancel()
+            await asyncio.gather(*tasks, *workers, return_exceptions=True)
+        return self.stats
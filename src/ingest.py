@@ -0,0 +1,127 @@
+"""
+Bulk loading of recorded bets.
+
+Bet logs are CSV files with amount and outcome columns, or JSON Lines files with
+"amount" and "outcome" keys, where outcome is a name made by BinBuilder such as
+"Black", "1-2-4-5" or "Dozen 2". Files are read in chunks of lines; each chunk's
+outcome names are resolved to interned outcome ids in one step over its distinct
+names, and the bets go straight into a BetBatch without creating Bet objects.
+Names the wheel does not know are skipped and reported together at the end.
+"""
+
+import collections
+import csv
+from dataclasses import dataclass, field
+import itertools
+import json
+
+import numpy as np
+
+from roulette import BetBatch, Table, Wheel
+
+
+@dataclass
+class IngestReport:
+    """
+    Result of loading a bet file
+
+    batch: BetBatch holding every bet that was resolved
+    lines: number of bet lines read
+    loaded: number of bets added to the batch
+    unknown: count of each outcome name the wheel does not have
+    """
+    batch: BetBatch
+    lines: int = 0
+    loaded: int = 0
+    unknown: collections.Counter = field(default_factory=collections.Counter)
+
+
+def outcomeIndex(wheel: Wheel) -> dict:
+    """
+
+    :param wheel: built Wheel
+    :return: dict of outcome name to the outcome's id on this wheel
+    """
+    ids = wheel.outcome_ids
+    return {name: ids[outcome] for name, outcome in wheel.all_outcomes.items()}
+
+
+def _csvRows(f):
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [name.strip().lower() for name in header]
+    if "amount" in columns and "outcome" in columns:
+        amount, outcome = columns.index("amount"), columns.index("outcome")
+    else:
+        amount, outcome = 0, 1
+        yield header[amount], header[outcome]
+    for row in reader:
+        if row:
+            yield row[amount], row[outcome]
+
+
+def _jsonRows(f):
+    for line in f:
+        if line.strip():
+            record = json.loads(line)
+            yield record["amount"], record["outcome"]
+
+
+def resolveNames(index: dict, names: list) -> np.ndarray:
+    """
+
+    :param index: dict of outcome name to id, from outcomeIndex
+    :param names: outcome names
+    :return: int array of outcome ids, -1 where a name is unknown; each distinct name is
+        looked up once
+    """
+    distinct, inverse = np.unique(np.asarray(names, dtype=str), return_inverse=True)
+    ids = np.fromiter((index.get(name, -1) for name in distinct.tolist()),
+                      dtype=np.int64, count=len(distinct))
+    return ids[inverse]
+
+
+def loadBets(path: str, wheel: Wheel, target=None, fmt: str = None,
+             chunk: int = 1 << 16) -> IngestReport:
+    """
+
+    :param path: CSV or JSON Lines bet file
+    :param wheel: Wheel whose outcome names are used
+    :param target: BetBatch to extend, which must be for wheel or a wheel sharing its
+        layout, or Table to place the loaded batch on; defaults to a new BetBatch
+    :param fmt: "csv" or "jsonl", defaults to guessing from the file extension
+    :param chunk: lines resolved at a time
+    :return: IngestReport with the batch, counts and unknown outcome names
+    """
+    if fmt is None:
+        fmt = "jsonl" if path.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"unknown bet file format {fmt!r}")
+    table = target if isinstance(target, Table) else None
+    batch = target if isinstance(target, BetBatch) else BetBatch(wheel)
+    if batch.wheel.id_space is not wheel.id_space:
+        raise ValueError("target batch is for a wheel with different outcome ids")
+    report = IngestReport(batch)
+    index = outcomeIndex(wheel)
+
+    with open(path, newline="") as f:
+        rows = _csvRows(f) if fmt == "csv" else _jsonRows(f)
+        while True:
+            block = list(itertools.islice(rows, chunk))
+            if not block:
+                break
+            amounts, names = zip(*block)
+            ids = resolveNames(index, names)
+            known = ids >= 0
+            if not known.all():
+                report.unknown.update(np.asarray(names, dtype=object)[~known].tolist())
+            batch.extendIds(np.asarray(amounts, dtype=np.float64)[known].tolist(),
+                            ids[known].tolist())
+            report.lines += len(block)
+            report.loaded += int(known.sum())
+
+    if table is not None:
+        table.placeBatch(batch)
+    return report
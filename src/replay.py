@@ -0,0 +1,197 @@
+"""
+Recording of played sessions and replaying them to check that settlement has not changed.
+
+SessionRecorder attaches to a Game as its event sink. The file starts with a header
+holding the names of the wheel's outcomes and a pickle of the wheel's rng as it was
+when recording began; random.Random and rng.BlockRandom both pickle as a small
+state. After the header, each spin is one fixed-size record followed by its bets:
+
+    spin:  bin index (u1), bet count (u2), net payout (f8)
+    bet:   outcome number in the header's name list (u2), amount (f8)
+
+Spins without bets are recorded too, with the bin they landed on, so the file holds
+the whole sequence of chosen bins.
+
+replay reads the file a spin at a time. It restores the rng on a wheel with the same
+outcome names, places each spin's bets, resolves the spin through Game and compares
+the bin and the net payout with the recording. Net payouts are summed with math.fsum
+on both sides, so they match exactly whatever order the bets are settled in. Bet
+batches settle without events and are not recorded.
+"""
+
+import copy
+from dataclasses import dataclass
+import math
+import pickle
+import struct
+
+from events import EventSink, SettlementEvent
+from roulette import Bet, Game, Table, Wheel, americanWheel
+
+MAGIC = b"RSRP"
+VERSION = 2
+HEADER = struct.Struct("<4sB")
+SPIN = struct.Struct("<BHd")
+BET = struct.Struct("<Hd")
+
+
+class SessionRecorder(EventSink):
+    """
+    Event sink that writes every spin of a game to a replay file. Events are passed on
+    to the sink the game had before, which is put back by close.
+
+    game: the Game being recorded
+    spins: number of spins written
+    """
+    game: Game
+    spins: int
+
+    def __init__(self, path: str, game: Game, buffer: int = 1 << 16) -> None:
+        """
+
+        :param path: file to write
+        :param game: game to record from its next spin on; its wheel must hold every
+            outcome bet on
+        :param buffer: bytes gathered between writes
+        """
+        wheel = game.wheel
+        self.game = game
+        self.spins = 0
+        self._ids = wheel.outcome_ids
+        self._inner = game.sink
+        self._bets = []
+        self._payouts = []
+        self._buffer = bytearray()
+        self._limit = buffer
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        names = [outcome.name for outcome in wheel.outcomes_by_id]
+        pickle.dump((names, wheel.rng), self.file, pickle.HIGHEST_PROTOCOL)
+        game.sink = self
+
+    def emit(self, event: SettlementEvent) -> None:
+        oid = self._ids.get(event.bet.outcome)
+        if oid is None:
+            raise ValueError(f"{event.bet.outcome} is not an outcome of the recorded wheel")
+        self._bets.append(BET.pack(oid, event.bet.amountBet))
+        self._payouts.append(event.payout)
+        if self._inner.active:
+            self._inner.emit(event)
+
+    def endSpin(self, spin: int, bin: int) -> None:
+        self._buffer += SPIN.pack(bin, len(self._bets), math.fsum(self._payouts))
+        self._buffer += b"".join(self._bets)
+        self.spins += 1
+        self._bets.clear()
+        self._payouts.clear()
+        if len(self._buffer) >= self._limit:
+            self.file.write(self._buffer)
+            self._buffer.clear()
+        if self._inner.active:
+            self._inner.endSpin(spin, bin)
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        self.file.write(self._buffer)
+        self.file.close()
+        self.game.sink = self._inner
+
+
+@dataclass(frozen=True)
+class Divergence:
+    """
+    First place a replay differed from its recording
+
+    spin: spin number, counted from the start of the recording
+    field: "bin" or "net"
+    expected: recorded value
+    actual: replayed value
+    """
+    spin: int
+    field: str
+    expected: float
+    actual: float
+
+    def __str__(self) -> str:
+        return f"spin {self.spin}: {self.field} was {self.expected}, replay gave {self.actual}"
+
+
+@dataclass
+class ReplayReport:
+    """
+    Result of a replay
+
+    spins: spins replayed
+    divergence: first Divergence, None when every spin matched
+    """
+    spins: int
+    divergence: Divergence = None
+
+    def __str__(self) -> str:
+        if self.divergence is None:
+            return f"{self.spins} spins replayed, all identical"
+        return f"{self.spins} spins replayed, first divergence at {self.divergence}"
+
+
+class _ReplayPlayer:
+    """
+    Seat for the recorded bets, keeps the net result of the last spin
+    """
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        self.net = 0.0
+
+    def settle(self, wins: list, losses: list) -> None:
+        self.net = math.fsum([bet.winAmount() - bet.loseAmount() for bet in wins]
+                             + [-bet.loseAmount() for bet in losses])
+
+
+def replay(path: str, wheel: Wheel = None, stop: bool = True) -> ReplayReport:
+    """
+    Replays a recording through Game, streaming it from the file
+
+    :param path: file written by SessionRecorder
+    :param wheel: wheel with the recorded layout, defaults to americanWheel(); outcomes
+        are looked up by name and a copy of the wheel spins with the recorded rng, so the
+        wheel passed in is left as it was
+    :param stop: stop at the first divergence instead of reading the rest of the file
+    :return: ReplayReport with the spins replayed and the first divergence
+    """
+    with open(path, "rb") as f:
+        magic, version = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay file")
+        names, rng = pickle.load(f)
+        wheel = copy.copy(americanWheel() if wheel is None else wheel)
+        wheel.rng = rng
+        missing = [name for name in names if name not in wheel.all_outcomes]
+        if missing:
+            raise ValueError(f"outcomes {missing} are not on the wheel")
+        outcomes = [wheel.all_outcomes[name] for name in names]
+        table = Table()
+        player = _ReplayPlayer(table)
+        players = (player,)
+        game = Game(table, wheel)
+        report = ReplayReport(0)
+        read, spin_size, bet_size = f.read, SPIN.size, BET.size
+        while True:
+            record = read(spin_size)
+            if len(record) < spin_size:
+                break
+            index, count, net = SPIN.unpack(record)
+            table.clear()
+            if count:
+                table.placeBets([Bet(amount, outcomes[oid]) for oid, amount
+                                 in BET.iter_unpack(read(bet_size * count))])
+            wbin = game.resolve(players)
+            spin = report.spins
+            report.spins += 1
+            if report.divergence is None:
+                if wbin.index != index:
+                    report.divergence = Divergence(spin, "bin", index, wbin.index)
+                elif player.net != net:
+                    report.divergence = Divergence(spin, "net", net, player.net)
+                if report.divergence is not None and stop:
+                    break
+        return report
@@ -0,0 +1,124 @@
+"""
+Random sources for Wheel.
+
+A Wheel only needs its rng to provide choice(seq), seed(...), getstate() and
+setstate(state), which random.Random already does. BlockRandom provides the same
+interface but draws bin indices in large blocks from a NumPy Generator and hands
+them out one at a time, which removes most of the per-spin cost of choice.
+"""
+
+import collections.abc
+
+import numpy as np
+
+
+class BlockRandom:
+    """
+    Random source that pre-generates indices in blocks
+
+    block: number of indices drawn from the generator at a time
+    """
+    block: int
+
+    def __init__(self, seed=None, block: int = 1 << 16) -> None:
+        """
+
+        :param seed: seed for the generator, None for fresh entropy
+        :param block: number of indices drawn from the generator at a time
+        """
+        self.block = block
+        self.seed(seed)
+
+    def seed(self, seed=None) -> None:
+        """
+        Restarts the sequence, the same seed always gives the same indices
+
+        :param seed: int seed, None for fresh entropy
+        :return:
+        """
+        self._generator = np.random.Generator(np.random.PCG64(seed))
+        self._size = 0
+        self._block_state = self._generator.bit_generator.state
+        self._values = np.empty(0, dtype=np.intp)
+        self._list = []
+        self._pos = 0
+
+    def _refill(self, size: int) -> None:
+        self._block_state = self._generator.bit_generator.state
+        self._size = size
+        self._values = self._generator.integers(0, size, self.block, dtype=np.intp)
+        self._list = self._values.tolist()
+        self._pos = 0
+
+    def index(self, size: int) -> int:
+        """
+
+        :param size: number of choices
+        :return: next index in range(size)
+        """
+        if self._pos >= self.block or size != self._size:
+            self._refill(size)
+        pos = self._pos
+        self._pos = pos + 1
+        return self._list[pos]
+
+    def choice(self, seq: collections.abc.Sequence):
+        """
+
+        :param seq: non-empty sequence, usually Wheel.bins
+        :return: the element at the next index
+        """
+        return seq[self.index(len(seq))]
+
+    def indices(self, size: int, count: int) -> np.ndarray:
+        """
+        Takes many indices at once, giving exactly what count calls of index(size) would
+
+        :param size: number of choices
+        :param count: number of indices
+        :return: int array of indices in range(size)
+        """
+        parts = []
+        while count > 0:
+            if self._pos >= self.block or size != self._size:
+                self._refill(size)
+            take = min(count, self.block - self._pos)
+            parts.append(self._values[self._pos:self._pos + take])
+            self._pos += take
+            count -= take
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+    def getstate(self) -> tuple:
+        """
+
+        :return: small snapshot of the position in the sequence: the generator state from
+            before the current block, the size the block was drawn for and the offset into it
+        """
+        return self._block_state, self._size, self._pos
+
+    def setstate(self, state: tuple) -> None:
+        """
+
+        :param state: snapshot from getstate
+        :return:
+        """
+        block_state, size, pos = state
+        self._generator.bit_generator.state = block_state
+        if size:
+            self._refill(size)
+        else:
+            self._block_state = block_state
+            self._size = 0
+            self._values = np.empty(0, dtype=np.intp)
+            self._list = []
+        self._pos = pos
+
+    def __reduce__(self):
+        # pickle the position in the sequence rather than the buffered block
+        return _unpickle, (self.block, self.getstate())
+
+
+def _unpickle(block: int, state: tuple) -> BlockRandom:
+    rng = BlockRandom(block=block)
+    rng.setstate(state)
+    return rng
@@ -1,7 +1,16 @@
+from array import array
 from dataclasses import dataclass
+from fractions import Fraction
 import collections
+import functools
+import math
 import os
+import pickle
 import random
+import time
+import types
+
+from events import NullSink, SettlementEvent
 
 
 class Outcome:
@@ -11,8 +20,12 @@ class Outcome:
     Red, 1:1
     1, 35:1
     """
+    __slots__ = ("name", "odds", "id", "id_space")
+
     name: str
     odds: int
+    id: int
+    id_space: object
 
     def __init__(self, name: str, odds: int) -> None:
         """
@@ -22,6 +35,8 @@ class Outcome:
         """
         self.name = name
         self.odds = odds
+        self.id = None
+        self.id_space = None
 
     def winAmount(self, amount: float) -> float:
         """
@@ -37,7 +52,8 @@ class Outcome:
         :param other: Another outcome object to compare against
         :return: Returns true if outcome names are the same
         """
-
+        if not isinstance(other, Outcome):
+            return NotImplemented
         return self.name == other.name and self.odds == other.odds
 
     def __ne__(self, other) -> bool:
@@ -46,7 +62,8 @@ class Outcome:
         :param other: Another outcome object to compare against
         :return: Returns true if outcome names are not the same
         """
-
+        if not isinstance(other, Outcome):
+            return NotImplemented
         return self.name != other.name or self.odds != other.odds
 
     def __hash__(self) -> int:
@@ -80,9 +97,18 @@ class Bin(frozenset):
     Contains a collection of outcomes for a single roulette wheel output
 
     outcomes: set of outcomes for the bin. Outcomes can be added with addOutcome method.
+        Check membership with hasOutcome or the outcomes set; the frozenset base of the
+        bins of a Wheel stays empty, however the wheel was built.
+    mask: integer bitmask of the interned outcome ids in the bin, bit n is set when the
+        outcome with id n is in the bin. Only filled for outcomes added through a Wheel.
+    index: position of the bin on its Wheel, None for a bin that is not on a wheel.
+    id_space: id_space of the Wheel whose outcome ids the mask holds, None off a wheel.
 
     """
     outcomes: set
+    mask: int
+    index: int
+    id_space: object
 
     def __init__(self, outcomes={}) -> None:
         """
@@ -90,40 +116,93 @@ class Bin(frozenset):
         :param outcomes:set of outcomes that will become a frozenset to make up the initial bin
         """
         self.outcomes = frozenset(outcomes)
+        self.mask = 0
+        self.index = None
+        self.id_space = None
 
-    def addOutcome(self, outcome: Outcome) -> None:
+    def addOutcome(self, outcome: Outcome, oid: int = None) -> None:
         """
 
         :param outcome: Outcome() to be added to the bin
+        :param oid: interned id of the outcome, sets the matching bit of mask when given
         :return: Updates the outcomes in the bin
         """
         self.outcomes |= {outcome}
+        if oid is not None:
+            self.mask |= 1 << oid
+
+    def hasOutcome(self, outcome: Outcome) -> bool:
+        """
+
+        :param outcome: Outcome() to look for
+        :return: True if the outcome is in the bin. Outcomes interned by this bin's wheel
+            are checked with a bit test on mask; anything else, including outcomes last
+            interned by another wheel, falls back to the outcomes set
+        """
+        space = self.id_space
+        if space is None or outcome.id_space is not space:
+            return outcome in self.outcomes
+        return bool(self.mask >> outcome.id & 1)
+
+
+class FrozenWheel(Exception):
+    def __init__(self):
+        super().__init__()
 
 
 class Wheel:
 
     bins: collections.abc.Sequence
     all_outcomes: dict
+    outcome_ids: dict
+    outcomes_by_id: list
     rng: int
+    frozen: bool
 
-    def __init__(self) -> None:
+    LAYOUT_VERSION = 1
+
+    def __init__(self, rng=None, size: int = 38) -> None:
         """
 
+        :param rng: random source with choice, seed, getstate and setstate, such as
+            rng.BlockRandom; defaults to a new random.Random
+        :param size: number of bins, 38 for the American wheel
         """
-        self.bins = tuple(Bin() for i in range(38))
+        self.id_space = object()
+        self.bins = tuple(Bin() for i in range(size))
+        for i, b in enumerate(self.bins):
+            b.index = i
+            b.id_space = self.id_space
         self.all_outcomes = {}
-        self.rng = random.Random()
+        self.outcome_ids = {}
+        self.outcomes_by_id = []
+        self.rng = random.Random() if rng is None else rng
+        self.frozen = False
 
 
     def addOutcome(self, number: int, outcome: Outcome) -> None:
         """
 
-        :param number:
-        :param outcome:
+        :param number: index of the bin receiving the outcome
+        :param outcome: Outcome() to add. Each distinct outcome is given a dense integer id
+            the first time it is added. The id is stored on the outcome as outcome.id along
+            with this wheel's id_space; an outcome added to several wheels keeps the id of
+            the first one, so wheels that are already built and shared never see their
+            outcomes change, and the other wheels fall back to comparing outcomes
         :return:
         """
+        if self.frozen:
+            raise FrozenWheel
+        oid = self.outcome_ids.get(outcome)
+        if oid is None:
+            oid = len(self.outcomes_by_id)
+            self.outcome_ids[outcome] = oid
+            self.outcomes_by_id.append(outcome)
+        if outcome.id_space is None:
+            outcome.id = oid
+            outcome.id_space = self.id_space
         self.all_outcomes[outcome.name] = outcome
-        self.bins[number].addOutcome(outcome)
+        self.bins[number].addOutcome(outcome, oid)
 
     def choose(self) -> Bin:
         """
@@ -148,6 +227,135 @@ class Wheel:
         """
         return self.all_outcomes[name]
 
+    def packedMasks(self) -> bytes:
+        """
+
+        :return: bin masks packed into one byte string, each bin takes the same number of
+            little-endian bytes (enough for every interned outcome id)
+        """
+        width = (len(self.outcomes_by_id) + 7) // 8
+        return b"".join(b.mask.to_bytes(width, "little") for b in self.bins)
+
+    def freeze(self) -> None:
+        """
+        Stops any further outcomes being added so the layout can be shared between games
+
+        :return:
+        """
+        self.frozen = True
+        self.all_outcomes = types.MappingProxyType(dict(self.all_outcomes))
+        self.outcome_ids = types.MappingProxyType(dict(self.outcome_ids))
+        self.outcomes_by_id = tuple(self.outcomes_by_id)
+
+    def share(self, rng=None) -> "Wheel":
+        """
+        Freezes this wheel and returns a new wheel with the same bins and outcomes but
+        its own rng, so several games can spin independently without rebuilding the layout
+
+        :param rng: random source for the new wheel, defaults to a new random.Random
+        :return: frozen Wheel sharing this wheel's layout
+        """
+        if not self.frozen:
+            self.freeze()
+        wheel = Wheel.__new__(Wheel)
+        wheel.id_space = self.id_space
+        wheel.bins = self.bins
+        wheel.all_outcomes = self.all_outcomes
+        wheel.outcome_ids = self.outcome_ids
+        wheel.outcomes_by_id = self.outcomes_by_id
+        wheel.rng = random.Random() if rng is None else rng
+        wheel.frozen = True
+        return wheel
+
+    def saveLayout(self, path: str) -> None:
+        """
+        Writes the outcomes and the outcome ids of every bin to a small pickle file
+
+        :param path: file to write
+        :return:
+        """
+        outcomes = [(o.name, o.odds) for o in self.outcomes_by_id]
+        bins = [(tuple(n for n in range(len(outcomes)) if b.mask >> n & 1), b.mask)
+                for b in self.bins]
+        with open(path, "wb") as f:
+            pickle.dump((self.LAYOUT_VERSION, outcomes, bins), f, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def loadLayout(cls, path: str) -> "Wheel":
+        """
+        Reads a layout written by saveLayout, creating each Bin once instead of replaying
+        every addOutcome call
+
+        :param path: file to read
+        :return: new Wheel with the saved layout
+        """
+        with open(path, "rb") as f:
+            version, outcomes, bins = pickle.load(f)
+        if version != cls.LAYOUT_VERSION:
+            raise ValueError(f"unsupported wheel layout version {version!r}")
+        wheel = cls.__new__(cls)
+        wheel.id_space = object()
+        wheel.outcomes_by_id = [Outcome(name, odds) for name, odds in outcomes]
+        wheel.outcome_ids = {}
+        wheel.all_outcomes = {}
+        for oid, outcome in enumerate(wheel.outcomes_by_id):
+            outcome.id = oid
+            outcome.id_space = wheel.id_space
+            wheel.outcome_ids[outcome] = oid
+            wheel.all_outcomes[outcome.name] = outcome
+        wheel.bins = tuple(cls._layoutBin(wheel, i, ids, mask)
+                           for i, (ids, mask) in enumerate(bins))
+        wheel.rng = random.Random()
+        wheel.frozen = False
+        return wheel
+
+    @classmethod
+    def fromLayout(cls, layout: "Layout", rng=None) -> "Wheel":
+        """
+        Builds the wheel for a declared layout in one pass: every outcome and the bins it
+        covers are gathered first and then each Bin is created once, already holding its
+        outcomes and mask, instead of being rebuilt by one addOutcome call per outcome
+
+        :param layout: Layout to build, such as AMERICAN, EUROPEAN or TRIPLE_ZERO
+        :param rng: random source for the wheel, defaults to a new random.Random
+        :return: new Wheel; outcome ids are given in the order BinBuilder would give them
+        """
+        wheel = cls.__new__(cls)
+        wheel.id_space = object()
+        wheel.outcomes_by_id = []
+        wheel.outcome_ids = {}
+        wheel.all_outcomes = {}
+        ids = [[] for _ in range(layout.size)]
+        masks = [0] * layout.size
+        for oid, (name, odds, numbers) in enumerate(layout.outcomes()):
+            outcome = Outcome(name, odds)
+            outcome.id = oid
+            outcome.id_space = wheel.id_space
+            wheel.outcomes_by_id.append(outcome)
+            wheel.outcome_ids[outcome] = oid
+            wheel.all_outcomes[name] = outcome
+            bit = 1 << oid
+            for n in numbers:
+                ids[n].append(oid)
+                masks[n] |= bit
+        wheel.bins = tuple(cls._layoutBin(wheel, i, ids[i], masks[i])
+                           for i in range(layout.size))
+        wheel.rng = random.Random() if rng is None else rng
+        wheel.frozen = False
+        return wheel
+
+    @staticmethod
+    def _layoutBin(wheel: "Wheel", index: int, ids: tuple, mask: int) -> Bin:
+        outcomes = wheel.outcomes_by_id
+        # like the bins of Wheel(), the frozenset base stays empty and the outcomes live
+        # in the outcomes attribute, which addOutcome can extend
+        wbin = Bin()
+        wbin.outcomes = frozenset([outcomes[n] for n in ids])
+        wbin.mask = mask
+        wbin.index = index
+        wbin.id_space = wheel.id_space
+        return wbin
+
 
 class BinBuilder:
 
@@ -354,10 +562,122 @@ class BinBuilder:
         self.fivebet(6)
 
 
+@dataclass(frozen=True)
+class Layout:
+    """
+    A wheel declared as data. Numbers 1 to 36 sit in bins 1 to 36 with the usual inside
+    and outside bets; the zeros take bin 0 and then bins 37 onwards
+
+    name: name of the layout
+    zeros: labels of the zero pockets, the first one goes in bin 0
+    extras: (name, odds, bins) of further outcomes, such as the American five bet
+    """
+    name: str
+    zeros: tuple
+    extras: tuple = ()
+
+    RED = frozenset((1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36))
+
+    @property
+    def size(self) -> int:
+        return 36 + len(self.zeros)
+
+    def outcomes(self):
+        """
+        Yields every outcome of the layout in the order BinBuilder.buildbins first adds
+        them, so both builders give the same outcome ids
+
+        :return: generator of (name, odds, bins) tuples
+        """
+        for i, label in enumerate(self.zeros[1:], 37):
+            yield label, 35, (i,)
+        yield self.zeros[0], 35, (0,)
+        for n in range(1, 37):
+            yield str(n), 35, (n,)
+        for r in range(12):
+            c1, c2, c3 = 3*r + 1, 3*r + 2, 3*r + 3
+            pairs = [(c1, 1), (c2, 1)]
+            if r < 11:
+                pairs += [(c1, 3), (c2, 3), (c3, 3)]
+            for n, step in pairs:
+                yield f"{n}-{n + step}", 17, (n, n + step)
+        for r in range(12):
+            n = 3*r + 1
+            yield f"{n}-{n + 1}-{n + 2}", 11, (n, n + 1, n + 2)
+        for r in range(11):
+            for n in (3*r + 1, 3*r + 2):
+                yield f"{n}-{n + 1}-{n + 3}-{n + 4}", 8, (n, n + 1, n + 3, n + 4)
+        for r in range(11):
+            n = 3*r + 1
+            yield "-".join(str(n + k) for k in range(6)), 5, tuple(range(n, n + 6))
+        for d in range(3):
+            yield f"Dozen {d + 1}", 2, tuple(range(12*d + 1, 12*d + 13))
+        for c in range(3):
+            yield f"Column {c + 1}", 2, tuple(range(c + 1, 37, 3))
+        numbers = range(1, 37)
+        yield "Low", 1, tuple(range(1, 19))
+        yield "Odd", 1, tuple(n for n in numbers if n % 2)
+        yield "Red", 1, tuple(n for n in numbers if n in self.RED)
+        yield "Even", 1, tuple(n for n in numbers if not n % 2)
+        yield "Black", 1, tuple(n for n in numbers if n not in self.RED)
+        yield "High", 1, tuple(range(19, 37))
+        yield from self.extras
+
+
+AMERICAN = Layout("American", ("0", "00"), (("Five Bet", 6, (0, 37, 1, 2, 3)),))
+EUROPEAN = Layout("European", ("0",))
+TRIPLE_ZERO = Layout("Triple zero", ("0", "00", "000"))
+
+
+@functools.lru_cache(maxsize=None)
+def _sharedLayout(layout: Layout) -> Wheel:
+    wheel = Wheel.fromLayout(layout)
+    wheel.freeze()
+    return wheel
+
+
+def layoutWheel(layout: Layout, rng=None) -> Wheel:
+    """
+    Builds a declared layout once per process and hands out frozen wheels that share it
+
+    :param layout: Layout to spin, such as EUROPEAN
+    :param rng: random source for the wheel, defaults to a new random.Random
+    :return: frozen Wheel with the layout
+    """
+    return _sharedLayout(layout).share(rng)
+
+
+@functools.lru_cache(maxsize=None)
+def _americanLayout(path: str = None) -> Wheel:
+    if path is not None and os.path.exists(path):
+        wheel = Wheel.loadLayout(path)
+    else:
+        wheel = Wheel.fromLayout(AMERICAN)
+        if path is not None:
+            wheel.saveLayout(path)
+    wheel.freeze()
+    return wheel
+
+
+def americanWheel(path: str = None, rng=None) -> Wheel:
+    """
+    Builds the standard American wheel once per process and hands out frozen wheels that
+    share its layout, each with its own rng
+
+    :param path: optional layout file; loaded if it exists, otherwise written after the
+        first build
+    :param rng: random source for the wheel, defaults to a new random.Random
+    :return: frozen Wheel with the AMERICAN layout, the same one BinBuilder builds
+    """
+    return _americanLayout(path).share(rng)
+
+
 class Bet:
     """
 
     """
+    __slots__ = ("amountBet", "outcome")
+
     amountBet: int
     outcome: Outcome
 
@@ -389,14 +709,123 @@ class Bet:
 
         :return:
         """
-        return f"${self.amountBet:d} on {self.outcome}"
+        return f"${self.amountBet} on {self.outcome}"
 
     def __repr__(self) -> str:
         """
 
         :return:
         """
-        return f"Bet(amount={self.amountBet:d}, outcome={self.outcome!r})"
+        return f"Bet(amount={self.amountBet!r}, outcome={self.outcome!r})"
+
+
+class BetBatch:
+    """
+    Many bets on one wheel stored as parallel typed arrays instead of Bet objects
+
+    amounts: amount of each bet
+    outcome_ids: interned id (see Wheel.addOutcome) of each bet's outcome
+    """
+    wheel: Wheel
+    amounts: array
+    outcome_ids: array
+
+    def __init__(self, wheel: Wheel, amounts=(), outcomes=()) -> None:
+        """
+
+        :param wheel: Wheel whose outcome ids the batch uses
+        :param amounts: initial bet amounts
+        :param outcomes: Outcome of each initial bet
+        """
+        self.wheel = wheel
+        self.amounts = array("d")
+        self.outcome_ids = array("q")
+        self._totals = None
+        self.extend(amounts, outcomes)
+
+    def add(self, amount: float, outcome: Outcome) -> None:
+        """
+
+        :param amount: amount bet
+        :param outcome: Outcome on the batch's wheel
+        :return:
+        """
+        self.amounts.append(amount)
+        self.outcome_ids.append(self.wheel.outcome_ids[outcome])
+        self._totals = None
+
+    def extend(self, amounts, outcomes) -> None:
+        """
+
+        :param amounts: amounts bet
+        :param outcomes: Outcome of each bet, in the same order
+        :return:
+        """
+        ids = self.wheel.outcome_ids
+        self.amounts.extend(amounts)
+        self.outcome_ids.extend(ids[outcome] for outcome in outcomes)
+        if len(self.amounts) != len(self.outcome_ids):
+            raise ValueError("amounts and outcomes differ in length")
+        self._totals = None
+
+    def extendIds(self, amounts, outcome_ids) -> None:
+        """
+
+        :param amounts: amounts bet
+        :param outcome_ids: interned outcome id of each bet, in the same order
+        :return:
+        """
+        self.amounts.extend(amounts)
+        self.outcome_ids.extend(outcome_ids)
+        if len(self.amounts) != len(self.outcome_ids):
+            raise ValueError("amounts and outcome ids differ in length")
+        self._totals = None
+
+    def totals(self) -> dict:
+        """
+
+        :return: dict of outcome id to the total amount bet on it, cached until the batch changes
+        """
+        if self._totals is None:
+            totals = {}
+            for amount, oid in zip(self.amounts, self.outcome_ids):
+                totals[oid] = totals.get(oid, 0) + amount
+            self._totals = totals
+        return self._totals
+
+    def settle(self, wbin: Bin) -> float:
+        """
+
+        :param wbin: winning bin of the batch's wheel, or of a wheel sharing its layout
+        :return: net result of every bet in the batch; winners net their odds times the
+            amount and losers lose the amount, as with Bet.winAmount and Bet.loseAmount
+        """
+        if wbin.id_space is not self.wheel.id_space:
+            # the mask of another wheel's bin numbers its outcomes differently
+            raise ValueError("bin is not from the batch's wheel")
+        mask = wbin.mask
+        outcomes = self.wheel.outcomes_by_id
+        net = 0
+        for oid, amount in self.totals().items():
+            if mask >> oid & 1:
+                net += amount * outcomes[oid].odds
+            else:
+                net -= amount
+        return net
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def __iter__(self):
+        """
+
+        :return: iterator creating a Bet for each entry, for code that needs objects; whole
+            amounts come back as ints like the amounts of ordinary bets
+        """
+        outcomes = self.wheel.outcomes_by_id
+        for amount, oid in zip(self.amounts, self.outcome_ids):
+            yield Bet(int(amount) if amount.is_integer() else amount, outcomes[oid])
+
 
 class InvalidBet(Exception):
     def __init__(self):
@@ -404,39 +833,182 @@ class InvalidBet(Exception):
 
 
 
+class BetView(collections.abc.Sequence):
+    """
+    Read-only view of a table's bets that does not copy them
+    """
+    def __init__(self, bets: list) -> None:
+        self._bets = bets
+
+    def __len__(self) -> int:
+        return len(self._bets)
+
+    def __getitem__(self, index):
+        return self._bets[index]
+
+    def __iter__(self):
+        return iter(self._bets)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__:s}({self._bets!r})"
+
+
 class Table:
     """
 
+    Keeps the total amount bet and the number of bets below the minimum up to date as bets
+    are placed and removed, so isValid does not need to look at the bets.
+
+    total: sum of the amounts of all bets on the table. Whole amounts are added as ints
+        and other amounts as exact Fractions, so placing and removing bets such as 0.1
+        leaves no rounding error behind
+    batches: BetBatch objects placed with placeBatch; they count towards total and the
+        minimum but are not part of iteration, Game settles them as a whole
+
+    The net result of the bets for every bin is compiled by payouts and cached until a
+    bet is placed or removed.
     """
     limit: int
     minimum: int
-    bets: list
+    total: float
+    batches: list
 
     def __init__(self, *inputs) -> None:
+        self._bets = []
+        self.batches = []
+        self._payouts = None
+        self._below = 0
+        self._whole = 0
+        self._parts = Fraction(0)
         self.limit = 1
-        self.minimum = 50
-        if inputs is None:
-            self.bets = []
+        self._minimum = 50
+        self.placeBets(inputs)
+
+    @property
+    def minimum(self) -> int:
+        return self._minimum
+
+    @minimum.setter
+    def minimum(self, value: int) -> None:
+        self._minimum = value
+        self._below = sum(1 for bet in self._bets if bet.amountBet < value)
+        for batch in self.batches:
+            self._below += sum(1 for amount in batch.amounts if amount < value)
+
+    @property
+    def total(self):
+        if self._parts:
+            return self._whole + float(self._parts)
+        return self._whole
+
+    def _add(self, amount) -> None:
+        if type(amount) is int:
+            self._whole += amount
         else:
-            self.bets = []
-            for i in inputs:
-                self.bets.append(i)
+            self._parts += Fraction(amount)
+
+    @property
+    def bets(self) -> BetView:
+        """
+
+        :return: read-only view of the bets in the order they were placed
+        """
+        return BetView(self._bets)
 
     def placeBet(self, bet: Bet) -> None:
-        self.bets.append(bet)
+        self._bets.append(bet)
+        self._payouts = None
+        self._add(bet.amountBet)
+        if bet.amountBet < self._minimum:
+            self._below += 1
+
+    def placeBets(self, bets) -> None:
+        """
+
+        :param bets: iterable of Bet to place in order
+        :return:
+        """
+        bets = list(bets)
+        self._bets.extend(bets)
+        self._payouts = None
+        for bet in bets:
+            self._add(bet.amountBet)
+            if bet.amountBet < self._minimum:
+                self._below += 1
+
+    def placeBatch(self, batch: BetBatch) -> None:
+        """
+
+        :param batch: filled BetBatch; it should not be changed while on the table
+        :return:
+        """
+        self.batches.append(batch)
+        self._payouts = None
+        self._add(math.fsum(batch.amounts))
+        self._below += sum(1 for amount in batch.amounts if amount < self._minimum)
+
+    def removeBet(self, bet: Bet) -> None:
+        """
+
+        :param bet: Bet on the table to take off
+        :return:
+        """
+        self._bets.remove(bet)
+        self._payouts = None
+        self._add(-bet.amountBet)
+        if bet.amountBet < self._minimum:
+            self._below -= 1
+
+    def clear(self) -> None:
+        """
+        Takes every bet off the table
+
+        :return:
+        """
+        self._bets.clear()
+        self.batches.clear()
+        self._payouts = None
+        self._below = 0
+        self._whole = 0
+        self._parts = Fraction(0)
+
+    def payouts(self, wheel: Wheel) -> tuple:
+        """
+        Net result of every bet on the table, batches included, for each bin of the wheel.
+        Each distinct outcome is checked against each bin once and the vector is kept
+        until the bets change, so a spin settles with payouts(wheel)[wbin.index]
+
+        :param wheel: Wheel the bets are settled against
+        :return: tuple with one float per bin; a winning bet nets winAmount() - loseAmount()
+            and a losing bet nets -loseAmount()
+        """
+        cached = self._payouts
+        if cached is not None and cached[0] is wheel:
+            return cached[1]
+        groups = {}
+        for bet in self._bets:
+            group = groups.get(bet.outcome)
+            if group is None:
+                groups[bet.outcome] = group = ([], [])
+            group[0].append(bet.winAmount() - bet.loseAmount())
+            group[1].append(-bet.loseAmount())
+        vector = []
+        for wbin in wheel.bins:
+            terms = []
+            for outcome, (wins, losses) in groups.items():
+                terms.extend(wins if wbin.hasOutcome(outcome) else losses)
+            terms.extend(batch.settle(wbin) for batch in self.batches)
+            vector.append(math.fsum(terms))
+        vector = tuple(vector)
+        self._payouts = (wheel, vector)
+        return vector
 
     def isValid(self) -> None:
-        total = 0
-        for i in self.bets:
-            if i.amountBet < self.minimum:
-                raise InvalidBet
-            else:
-                total += i.amountBet
-        if total > self.limit:
+        if self._below or self.total > self.limit:
             raise InvalidBet
 
     def __iter__(self):
-        return iter(self.bets[:])
+        return iter(self._bets)
 
     def __str__(self) -> str:
         out_str = "("
@@ -475,42 +1047,345 @@ class Passenger57:
 
     def win(self, bet: Bet) -> None:
         """
+        Called by Game for each winning bet. Results are reported through the game's
+        event sink, use events.ConsoleSink to print them.
 
         :param bet:
         :return:
         """
-        print( str(bet) + " is a winner! You win $" + str(bet.winAmount()))
 
     def lose(self, bet: Bet) -> None:
         """
+        Called by Game for each losing bet.
 
         :param bet:
         :return:
         """
-        print( str(bet) + " is a loser. You lose $" + str(bet.loseAmount()))
+
+    def settleBatch(self, batch: BetBatch, net: float) -> None:
+        """
+        Called by Game with the net result of each BetBatch on the player's table
+
+        :param batch:
+        :param net:
+        :return:
+        """
+
+    def settleNet(self, net: float) -> None:
+        """
+        Called by Game.cycleNet with the net result of the player's table for the spin
+
+        :param net:
+        :return:
+        """
+
+    def settle(self, wins: list, losses: list) -> None:
+        """
+        Called by Game with all of the player's results for a spin at a multi-player table
+
+        :param wins: winning bets
+        :param losses: losing bets
+        :return:
+        """
+        for bet in wins:
+            self.win(bet)
+        for bet in losses:
+            self.lose(bet)
+
+
+class Instrumentation:
+    """
+    Cumulative timings and counters for the phases of Game.cycle
+
+    seconds: total time spent in each phase
+    calls: number of times each phase ran
+    bets: number of bets settled
+    """
+    PHASES = ("placeBets", "choose", "settle")
+
+    seconds: dict
+    calls: dict
+    bets: int
+
+    def __init__(self) -> None:
+        self.seconds = dict.fromkeys(self.PHASES, 0.0)
+        self.calls = dict.fromkeys(self.PHASES, 0)
+        self.bets = 0
+
+    def record(self, phase: str, seconds: float) -> None:
+        """
+
+        :param phase: one of PHASES
+        :param seconds: time the phase took
+        :return:
+        """
+        self.seconds[phase] += seconds
+        self.calls[phase] += 1
+
+    def asDict(self) -> dict:
+        """
+
+        :return: plain dict of the seconds and calls of each phase and the bets settled
+        """
+        return {
+            "phases": {phase: {"seconds": self.seconds[phase], "calls": self.calls[phase]}
+                       for phase in self.PHASES},
+            "bets": self.bets,
+        }
+
+    def report(self) -> str:
+        """
+
+        :return: table of the phases with total and per-call time and share of the total
+        """
+        total = sum(self.seconds.values()) or 1
+        lines = [f"{'phase':10s} {'calls':>10s} {'seconds':>12s} {'us/call':>10s} {'share':>7s}"]
+        for phase in self.PHASES:
+            calls = self.calls[phase]
+            per_call = self.seconds[phase] / calls * 1e6 if calls else 0
+            lines.append(f"{phase:10s} {calls:10d} {self.seconds[phase]:12.6f} "
+                         f"{per_call:10.3f} {self.seconds[phase] / total:7.1%}")
+        lines.append(f"bets settled: {self.bets:d}")
+        return "\n".join(lines)
 
 
 class Game:
     """
 
+    sink: receives a SettlementEvent for every bet settled and an endSpin call for every
+        spin, defaults to a NullSink
+    spins: number of spins played so far, used as the spin index of events
+    instrumentation: per-phase timings of cycle, None unless instrumentation is enabled
+        with the instrument flag or the ROULETTE_INSTRUMENT environment variable
+    players: players seated with seat, all of them play when cycle is called without a player
     """
     wheel: Wheel
     table: Table
     player: Passenger57
+    players: list
+    sink: object
+    spins: int
+    instrumentation: Instrumentation
 
-    def __init__(self, table: Table, wheel: Wheel) -> None:
+    def __init__(self, table: Table, wheel: Wheel, sink=None, instrument: bool = None) -> None:
         self.wheel = wheel
         self.table = table
+        self.sink = NullSink() if sink is None else sink
+        self.spins = 0
+        if instrument is None:
+            instrument = os.environ.get("ROULETTE_INSTRUMENT", "") not in ("", "0")
+        self.instrumentation = Instrumentation() if instrument else None
+        self.players = []
 
-    def cycle(self, player: Passenger57):
-        player.placeBets()
-        wbin = self.wheel.choose()
-        for bet in iter(player.table):
-            if bet.outcome in wbin.outcomes:
-                player.win(bet)
-            else:
-                player.lose(bet)
+    def seat(self, player) -> None:
+        """
 
+        :param player: player to join the table; it needs placeBets, a table of its own bets
+            and either settle(wins, losses) or win and lose
+        :return:
+        """
+        self.players.append(player)
+
+    def cycle(self, player: Passenger57 = None):
+        """
+        Plays one spin
 
+        :param player: player to play the spin with; when omitted every seated player plays
+            and bets are settled grouped by outcome
+        :return:
+        """
+        if player is None:
+            players, settle = self.players, self._settleGrouped
+        else:
+            players, settle = (player,), self._settle
+        if self.instrumentation is not None:
+            self._timedCycle(players, settle)
+            return
+        for p in players:
+            p.placeBets()
+        settle(players, self.wheel.choose())
+
+    def resolve(self, players: collections.abc.Sequence = None) -> Bin:
+        """
+        Spins and settles bets the players have already placed, for callers that collect
+        bets themselves (such as host.AsyncGameHost)
+
+        :param players: players to settle, defaults to the seated players
+        :return: the winning Bin
+        """
+        players = self.players if players is None else players
+        stats = self.instrumentation
+        if stats is None:
+            wbin = self.wheel.choose()
+            self._settleGrouped(players, wbin)
+            return wbin
+        clock = time.perf_counter
+        start = clock()
+        wbin = self.wheel.choose()
+        chosen = clock()
+        stats.bets += self._settleGrouped(players, wbin)
+        stats.record("choose", chosen - start)
+        stats.record("settle", clock() - chosen)
+        return wbin
 
+    def cycleNet(self, player: Passenger57 = None) -> float:
+        """
+        Plays one spin and settles each table as a whole with one lookup in its cached
+        payout vector, instead of bet by bet. Players hear their net result through
+        settleNet, if they have it; win and lose are not called and no events are emitted
 
+        :param player: player to play the spin with, defaults to every seated player
+        :return: net result of all the tables for the spin
+        """
+        players = self.players if player is None else (player,)
+        for p in players:
+            p.placeBets()
+        wbin = self.wheel.choose()
+        spin = self.spins
+        self.spins += 1
+        total = 0.0
+        for p in players:
+            net = p.table.payouts(self.wheel)[wbin.index]
+            report = getattr(p, "settleNet", None)
+            if report is not None:
+                report(net)
+            total += net
+        if self.sink.active:
+            self.sink.endSpin(spin, wbin.index)
+        return total
+
+    def _timedCycle(self, players: collections.abc.Sequence, settle) -> None:
+        stats = self.instrumentation
+        clock = time.perf_counter
+        start = clock()
+        for p in players:
+            p.placeBets()
+        placed = clock()
+        wbin = self.wheel.choose()
+        chosen = clock()
+        stats.bets += settle(players, wbin)
+        settled = clock()
+        stats.record("placeBets", placed - start)
+        stats.record("choose", chosen - placed)
+        stats.record("settle", settled - chosen)
+
+    def _settle(self, players: collections.abc.Sequence, wbin: Bin) -> int:
+        """
+        Settles each bet of each player in turn
+
+        :param players: players whose tables are settled
+        :param wbin: winning bin
+        :return: number of bets settled
+        """
+        spin = self.spins
+        self.spins += 1
+        sink = self.sink if self.sink.active else None
+        ids = self.wheel.outcome_ids
+        settled = 0
+        for player in players:
+            for bet in iter(player.table):
+                if wbin.hasOutcome(bet.outcome):
+                    player.win(bet)
+                    if sink is not None:
+                        sink.emit(SettlementEvent(spin, wbin.index, bet, True,
+                                                  bet.winAmount() - bet.loseAmount(),
+                                                  ids.get(bet.outcome, -1)))
+                else:
+                    player.lose(bet)
+                    if sink is not None:
+                        sink.emit(SettlementEvent(spin, wbin.index, bet, False, -bet.loseAmount(),
+                                                  ids.get(bet.outcome, -1)))
+            settled += len(player.table.bets) + self._settleBatches(player, wbin)
+        if sink is not None:
+            sink.endSpin(spin, wbin.index)
+        return settled
+
+    def _settleBatches(self, player, wbin: Bin) -> int:
+        """
+        Settles the player's bet batches without creating Bet objects and reports each
+        batch's net result to the player's settleBatch, if it has one
+
+        :param player: player whose batches are settled
+        :param wbin: winning bin
+        :return: number of bets settled
+        """
+        batches = getattr(player.table, "batches", None)
+        if not batches:
+            return 0
+        report = getattr(player, "settleBatch", None)
+        settled = 0
+        for batch in batches:
+            net = batch.settle(wbin)
+            if report is not None:
+                report(batch, net)
+            settled += len(batch)
+        return settled
+
+    def _settleGrouped(self, players: collections.abc.Sequence, wbin: Bin) -> int:
+        """
+        Groups every player's bets by outcome, checks each distinct outcome against the
+        winning bin once and hands each player its wins and losses together
+
+        :param players: players whose tables are settled
+        :param wbin: winning bin
+        :return: number of bets settled
+        """
+        spin = self.spins
+        self.spins += 1
+        groups = {}
+        space = self.wheel.id_space
+        for seat, player in enumerate(players):
+            for bet in player.table:
+                outcome = bet.outcome
+                # ids are only comparable between outcomes interned by this wheel
+                key = outcome.id if outcome.id_space is space else outcome
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = group = ([], [])
+                group[0].append(seat)
+                group[1].append(bet)
+
+        results = [([], []) for _ in players]
+        settled = 0
+        for seats, bets in groups.values():
+            won = 0 if wbin.hasOutcome(bets[0].outcome) else 1
+            for seat, bet in zip(seats, bets):
+                results[seat][won].append(bet)
+            settled += len(bets)
+
+        sink = self.sink if self.sink.active else None
+        ids = self.wheel.outcome_ids
+        for player, (wins, losses) in zip(players, results):
+            settle = getattr(player, "settle", None)
+            if settle is not None:
+                settle(wins, losses)
+            else:
+                for bet in wins:
+                    player.win(bet)
+                for bet in losses:
+                    player.lose(bet)
+            if sink is not None:
+                for bet in wins:
+                    sink.emit(SettlementEvent(spin, wbin.index, bet, True,
+                                              bet.winAmount() - bet.loseAmount(),
+                                              ids.get(bet.outcome, -1)))
+                for bet in losses:
+                    sink.emit(SettlementEvent(spin, wbin.index, bet, False, -bet.loseAmount(),
+                                              ids.get(bet.outcome, -1)))
+            settled += self._settleBatches(player, wbin)
+        if sink is not None:
+            sink.endSpin(spin, wbin.index)
+        return settled
+
+    def runBatch(self, spins: int):
+        """
+        Spins the wheel many times against the bets currently on the table without
+        going through Bin and Bet objects for every spin. Needs NumPy.
+
+        :param spins: number of spins
+        :return: NumPy array with the net result of each spin; a winning bet nets
+            winAmount() - loseAmount() and a losing bet nets -loseAmount(). For the same
+            wheel.rng seed the bins match repeated calls to cycle
+        """
+        import batch
+        return batch.runBatch(self.wheel, self.table, spins)
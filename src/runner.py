@@ -0,0 +1,155 @@
+"""
+Runs many independent Passenger57 sessions over a pool of worker processes.
+
+Every session gets its own seed derived from a single master seed and the session
+number, so the merged report only depends on the master seed and never on how many
+workers took part or how the sessions were split between them.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import os
+
+import numpy as np
+
+from roulette import Game, Passenger57, Table, Wheel, americanWheel
+
+
+@dataclass
+class SessionStats:
+    """
+    Win/loss/net totals for one or more sessions
+    """
+    sessions: int = 0
+    spins: int = 0
+    wins: int = 0
+    losses: int = 0
+    net: float = 0
+
+    def merge(self, other: "SessionStats") -> "SessionStats":
+        """
+
+        :param other: stats to fold into this one
+        :return: self, updated in place
+        """
+        self.sessions += other.sessions
+        self.spins += other.spins
+        self.wins += other.wins
+        self.losses += other.losses
+        self.net += other.net
+        return self
+
+    def __str__(self) -> str:
+        """
+
+        :return: one line summary of the totals
+        """
+        per_session = self.net / self.sessions if self.sessions else 0
+        return (f"{self.sessions:d} sessions, {self.spins:d} spins: {self.wins:d} wins, "
+                f"{self.losses:d} losses, net ${self.net} (${per_session:.4f} per session)")
+
+
+class CountingPassenger57(Passenger57):
+    """
+    Passenger57 that tallies its results into a SessionStats
+    """
+    stats: SessionStats
+
+    def __init__(self, table: Table, wheel: Wheel, stats: SessionStats) -> None:
+        super().__init__(table, wheel)
+        self.stats = stats
+
+    def win(self, bet) -> None:
+        self.stats.wins += 1
+        self.stats.net += bet.winAmount() - bet.loseAmount()
+
+    def lose(self, bet) -> None:
+        self.stats.losses += 1
+        self.stats.net -= bet.loseAmount()
+
+
+def sessionSeed(seed: int, session: int) -> int:
+    """
+
+    :param seed: master seed of the run
+    :param session: session number
+    :return: seed for that session's wheel, independent of every other session's seed
+    """
+    state = np.random.SeedSequence(seed, spawn_key=(session,)).generate_state(2, np.uint64)
+    return int(state[0]) << 64 | int(state[1])
+
+
+def playSessions(wheel: Wheel, seed: int, start: int, stop: int, spins: int,
+                 aggregate=None) -> SessionStats:
+    """
+    Plays sessions start..stop-1 on one wheel, reseeding it for every session.
+    Bets are taken off the table once they are settled.
+
+    :param wheel: built wheel, reused for every session
+    :param seed: master seed of the run
+    :param start: first session number
+    :param stop: session number to stop before
+    :param spins: spins per session
+    :param aggregate: optional stats.ResultAggregate fed the net result of every session
+    :return: merged stats of the sessions
+    """
+    stats = SessionStats()
+    for session in range(start, stop):
+        before = stats.net
+        wheel.rng.seed(sessionSeed(seed, session))
+        table = Table()
+        player = CountingPassenger57(table, wheel, stats)
+        game = Game(table, wheel)
+        for _ in range(spins):
+            game.cycle(player)
+            table.clear()
+        stats.sessions += 1
+        stats.spins += spins
+        if aggregate is not None:
+            aggregate.push(stats.net - before)
+    return stats
+
+
+_wheel = None
+
+
+def _initWorker() -> None:
+    """
+    Builds the wheel once for every session the worker process will play
+    """
+    global _wheel
+    _wheel = americanWheel()
+
+
+def _playChunk(seed: int, start: int, stop: int, spins: int, aggregate=None) -> tuple:
+    return playSessions(_wheel, seed, start, stop, spins, aggregate), aggregate
+
+
+def runSessions(sessions: int, spins: int, seed: int, workers: int = None,
+                chunk: int = None, aggregate=None) -> SessionStats:
+    """
+
+    :param sessions: number of sessions to play
+    :param spins: spins per session
+    :param seed: master seed; the same seed always gives the same report
+    :param workers: number of worker processes, defaults to the CPU count
+    :param chunk: sessions handed to a worker at a time, defaults to an even split
+        into four chunks per worker
+    :param aggregate: optional stats.ResultAggregate; each chunk fills an empty copy and
+        the copies are merged into it in session order
+    :return: stats of every session merged in session order
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk = chunk or max(1, -(-sessions // (workers * 4)))
+    bounds = [(start, min(start + chunk, sessions)) for start in range(0, sessions, chunk)]
+    total = SessionStats()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker) as pool:
+        futures = [pool.submit(_playChunk, seed, start, stop, spins,
+                               None if aggregate is None else aggregate.empty())
+                   for start, stop in bounds]
+        for future in futures:
+            stats, part = future.result()
+            total.merge(stats)
+            if aggregate is not None:
+                aggregate.merge(part)
+    return total
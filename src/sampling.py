@@ -0,0 +1,162 @@
+"""
+Spin schedules: how the bins of a spin are drawn for many sessions at once.
+
+Every schedule gives each session, on each spin, a bin that is uniformly distributed
+over the wheel and independent of that session's other spins, exactly as
+Wheel.choose would. Averages over sessions are therefore unbiased estimates of the
+same expectations whichever schedule is used. The schedules differ only in how the
+sessions are coupled to each other:
+
+uniform: every session draws independently, plain Monte Carlo
+stratified: on every spin the sessions are dealt whole shuffled copies of the wheel,
+    so each bin comes up as close to equally often as the session count allows
+antithetic: sessions are paired and, with the bins ordered from winning to losing
+    for the bet, the second of each pair gets the bin mirroring the first one's
+
+Coupled sessions are not independent, so the spread of their results is not the
+error of their mean; compare repeated runs with compareSchedules instead.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+class Schedule:
+    """
+    Draws the bin of every session for one spin
+
+    hits: boolean array, True for each bin the bet wins on
+    rng: NumPy generator used for the draws
+    """
+    hits: np.ndarray
+    rng: np.random.Generator
+
+    def __init__(self, hits: np.ndarray, rng: np.random.Generator) -> None:
+        """
+
+        :param hits: boolean array over the bins of the wheel, True where the bet wins
+        :param rng: NumPy generator
+        """
+        self.hits = hits
+        self.rng = rng
+
+    def draw(self, sessions: int) -> np.ndarray:
+        """
+
+        :param sessions: number of sessions spinning
+        :return: int array with the bin index of every session
+        """
+        raise NotImplementedError
+
+
+class UniformSchedule(Schedule):
+    """
+    Independent uniform bins, the same draws simulate has always made
+    """
+    def draw(self, sessions: int) -> np.ndarray:
+        return self.rng.integers(0, len(self.hits), sessions)
+
+
+class StratifiedSchedule(Schedule):
+    """
+    Consecutive runs of sessions share one random permutation of the bins; every
+    position of a permutation is uniform, so each session's bin still is
+    """
+    def draw(self, sessions: int) -> np.ndarray:
+        n = len(self.hits)
+        copies = -(-sessions // n)
+        deck = np.broadcast_to(np.arange(n), (copies, n))
+        return self.rng.permuted(deck, axis=1).ravel()[:sessions]
+
+
+class AntitheticSchedule(Schedule):
+    """
+    Session 2i draws a uniform rank r and session 2i + 1 gets rank n - 1 - r, where
+    ranks list the winning bins first; a lone last session draws on its own
+    """
+    def __init__(self, hits: np.ndarray, rng: np.random.Generator) -> None:
+        super().__init__(hits, rng)
+        self.order = np.argsort(~hits, kind="stable")
+
+    def draw(self, sessions: int) -> np.ndarray:
+        n = len(self.order)
+        ranks = np.empty(sessions, dtype=np.int64)
+        ranks[0::2] = self.rng.integers(0, n, (sessions + 1) // 2)
+        ranks[1::2] = n - 1 - ranks[0:sessions - 1:2]
+        return self.order[ranks]
+
+
+SCHEDULES = {
+    "uniform": UniformSchedule,
+    "stratified": StratifiedSchedule,
+    "antithetic": AntitheticSchedule,
+}
+
+
+@dataclass
+class ScheduleReport:
+    """
+    Precision of one schedule over repeated simulations
+
+    name: schedule name
+    mean: mean final result per session over all replicates
+    variance: variance of the per-replicate mean, the squared error of one run
+    spins: spins played per replicate
+    efficiency: uniform variance divided by this variance; a run with the schedule is as
+        precise as efficiency uniform runs of the same size
+    """
+    name: str
+    mean: float
+    variance: float
+    spins: int
+    efficiency: float = 1.0
+
+    @property
+    def spinsForUniformPrecision(self) -> float:
+        """
+        Spins the schedule needs to match the precision of one uniform replicate
+        """
+        return self.spins / self.efficiency
+
+    def __str__(self) -> str:
+        return (f"{self.name:<11} mean {self.mean:10.4f}  variance {self.variance:10.4g}  "
+                f"efficiency {self.efficiency:6.2f}x  "
+                f"spins for uniform precision {self.spinsForUniformPrecision:12.0f} "
+                f"({1 / self.efficiency:.1%} of uniform)")
+
+
+def compareSchedules(strategy, wheel, spins: int, outcome, sessions: int,
+                     replicates: int = 30, bankroll: float = 0, seed=None,
+                     schedules=tuple(SCHEDULES)) -> list:
+    """
+    Runs strategies.simulate replicates times with each schedule and reports how the
+    error of the mean final result compares to plain Monte Carlo
+
+    :param strategy: callable taking a session count and returning a fresh Strategy
+    :param wheel: built Wheel giving the layout
+    :param spins: spins per session
+    :param outcome: Outcome every session bets on
+    :param sessions: sessions per replicate
+    :param replicates: independent runs per schedule, at least 2
+    :param bankroll: starting bankroll of every session
+    :param seed: seed from which every replicate's seed is derived
+    :param schedules: names of the schedules to compare
+    :return: list of ScheduleReport, one per schedule; efficiencies are relative to
+        the uniform schedule, which is run even when not listed
+    """
+    import strategies
+    seeds = np.random.SeedSequence(seed).spawn(replicates)
+    variances, reports = {}, []
+    for name in dict.fromkeys(("uniform",) + tuple(schedules)):
+        means = np.array([strategies.simulate(strategy(sessions), wheel, spins, outcome,
+                                              bankroll, s, schedule=name).mean()
+                          for s in seeds])
+        variances[name] = means.var(ddof=1)
+        if name in schedules:
+            reports.append(ScheduleReport(name, float(means.mean()), float(variances[name]),
+                                          spins * sessions))
+    for report in reports:
+        report.efficiency = (variances["uniform"] / report.variance if report.variance
+                             else np.inf)
+    return reports
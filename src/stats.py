@@ -0,0 +1,396 @@
+"""
+Streaming statistics that use constant memory and can be merged across runs.
+
+RunningStats keeps the count, mean, variance and range, Histogram counts values in
+fixed bins and QuantileSketch answers quantile queries to a relative accuracy.
+Each can be filled in one process, pickled and merged into another, so workers can
+aggregate their own sessions and the totals come out as if one process had seen
+every value. ResultAggregate bundles the three.
+"""
+
+import math
+import statistics
+
+import numpy as np
+
+
+def zScore(confidence: float) -> float:
+    """
+
+    :param confidence: two-sided confidence level, such as 0.95
+    :return: standard normal quantile for the level, 1.96 for 0.95
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    return statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+class RunningStats:
+    """
+    Count, mean, variance and range of a stream of values, updated with Welford's
+    method so no values are kept and long streams do not lose precision
+
+    count: number of values seen
+    mean: mean of the values
+    m2: sum of squared differences from the mean
+    min: smallest value, inf until a value is seen
+    max: largest value, -inf until a value is seen
+    """
+    count: int
+    mean: float
+    m2: float
+    min: float
+    max: float
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, value: float) -> None:
+        """
+
+        :param value: next value of the stream
+        :return:
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def extend(self, values) -> None:
+        """
+        Adds many values at once, such as a NumPy array of spin results
+
+        :param values: sequence or array of values
+        :return:
+        """
+        count = len(values)
+        if not count:
+            return
+        try:
+            mean = float(values.mean())
+            m2 = float(((values - mean) ** 2).sum())
+            low, high = float(values.min()), float(values.max())
+        except AttributeError:
+            mean = math.fsum(values) / count
+            m2 = math.fsum((v - mean) ** 2 for v in values)
+            low, high = min(values), max(values)
+        self._combine(count, mean, m2, low, high)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """
+        Adds the values seen by other, as if they had been pushed here
+
+        :param other: RunningStats of another stream
+        :return: self
+        """
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    def _combine(self, count: int, mean: float, m2: float, low: float, high: float) -> None:
+        if not count:
+            return
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        """
+        Sample variance, 0 until there are two values
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self) -> float:
+        """
+        Standard error of the mean, infinite until there are two values
+        """
+        return math.sqrt(self.variance / self.count) if self.count > 1 else math.inf
+
+    def halfWidth(self, confidence: float = 0.95) -> float:
+        """
+
+        :param confidence: confidence level of the interval
+        :return: half the width of the normal confidence interval for the mean
+        """
+        return zScore(confidence) * self.stderr
+
+    def interval(self, confidence: float = 0.95) -> tuple:
+        """
+
+        :param confidence: confidence level of the interval
+        :return: (low, high) confidence interval for the mean
+        """
+        half = self.halfWidth(confidence)
+        return self.mean - half, self.mean + half
+
+    def __str__(self) -> str:
+        return f"n={self.count} mean={self.mean:.6g} sd={self.stddev:.6g}"
+
+
+class Histogram:
+    """
+    Counts of values in equal-width bins over a fixed range
+
+    edges: bin edges, one more than the number of bins
+    counts: int array of the values in each bin; a bin holds low <= value < high, the
+        last one also its upper edge
+    underflow: number of values below the range
+    overflow: number of values above the range
+    """
+    edges: np.ndarray
+    counts: np.ndarray
+    underflow: int
+    overflow: int
+
+    def __init__(self, low: float, high: float, bins: int = 100) -> None:
+        """
+
+        :param low: lower edge of the first bin
+        :param high: upper edge of the last bin
+        :param bins: number of bins
+        """
+        if not high > low:
+            raise ValueError("high must be above low")
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def push(self, value: float) -> None:
+        self.extend(np.array([value], dtype=np.float64))
+
+    def extend(self, values) -> None:
+        """
+
+        :param values: sequence or array of values
+        :return:
+        """
+        values = np.asarray(values, dtype=np.float64)
+        low, high, bins = self.edges[0], self.edges[-1], len(self.counts)
+        below, above = values < low, values > high
+        self.underflow += int(below.sum())
+        self.overflow += int(above.sum())
+        inside = values[~(below | above)]
+        index = ((inside - low) * (bins / (high - low))).astype(np.int64)
+        self.counts += np.bincount(np.minimum(index, bins - 1), minlength=bins)
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """
+
+        :param other: Histogram with the same bins
+        :return: self
+        """
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("histograms have different bins")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy (a DDSketch): values are counted
+    in logarithmically spaced buckets, so a quantile estimate is within accuracy times
+    the size of the true value. Negative values are kept in buckets of their own and
+    values smaller in size than 1e-9 count as zero. When a side has more than
+    max_buckets buckets the ones nearest zero are combined, which only costs accuracy
+    close to zero.
+
+    accuracy: relative accuracy of the estimates
+    count: number of values seen
+    """
+    accuracy: float
+    count: int
+
+    ZERO = 1e-9
+
+    def __init__(self, accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        """
+
+        :param accuracy: relative accuracy, between 0 and 1
+        :param max_buckets: limit on the buckets kept for each sign
+        """
+        if not 0 < accuracy < 1:
+            raise ValueError("accuracy must be between 0 and 1")
+        self.accuracy = accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+
+    def push(self, value: float) -> None:
+        self.extend(np.array([value], dtype=np.float64))
+
+    def extend(self, values) -> None:
+        """
+
+        :param values: sequence or array of values
+        :return:
+        """
+        values = np.asarray(values, dtype=np.float64)
+        size = np.abs(values)
+        zero = size < self.ZERO
+        self.zeros += int(zero.sum())
+        self.count += len(values)
+        for store, side in ((self.positive, values > 0), (self.negative, values < 0)):
+            side &= ~zero
+            if side.any():
+                keys = np.ceil(np.log(size[side]) / self._log_gamma).astype(np.int64)
+                buckets, counts = np.unique(keys, return_counts=True)
+                for key, n in zip(buckets.tolist(), counts.tolist()):
+                    store[key] = store.get(key, 0) + n
+                self._collapse(store)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+
+        :param other: sketch with the same accuracy
+        :return: self
+        """
+        if other.accuracy != self.accuracy:
+            raise ValueError("sketches have different accuracies")
+        for store, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, n in theirs.items():
+                store[key] = store.get(key, 0) + n
+            self._collapse(store)
+        self.zeros += other.zeros
+        self.count += other.count
+        return self
+
+    def _collapse(self, store: dict) -> None:
+        if len(store) <= self.max_buckets:
+            return
+        keys = sorted(store)
+        cut = keys[len(keys) - self.max_buckets]
+        store[cut] += sum(store.pop(key) for key in keys[:len(keys) - self.max_buckets])
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        """
+
+        :param q: quantile between 0 and 1
+        :return: estimate of the q quantile, nan if no values were seen
+        """
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+    def quantiles(self, qs=(0.05, 0.25, 0.5, 0.75, 0.95)) -> dict:
+        """
+
+        :param qs: quantiles to estimate
+        :return: dict of quantile to estimate
+        """
+        return {q: self.quantile(q) for q in qs}
+
+
+class ResultAggregate:
+    """
+    RunningStats, Histogram and QuantileSketch of one stream, such as the final
+    bankroll of every session, in memory that does not grow with the stream
+
+    stats: count, mean, variance, min and max
+    histogram: fixed-bin counts
+    sketch: quantile estimates
+    """
+    stats: RunningStats
+    histogram: Histogram
+    sketch: QuantileSketch
+
+    def __init__(self, low: float, high: float, bins: int = 100,
+                 accuracy: float = 0.01) -> None:
+        """
+
+        :param low: lower edge of the histogram
+        :param high: upper edge of the histogram
+        :param bins: number of histogram bins
+        :param accuracy: relative accuracy of the quantile sketch
+        """
+        self.stats = RunningStats()
+        self.histogram = Histogram(low, high, bins)
+        self.sketch = QuantileSketch(accuracy)
+
+    def push(self, value: float) -> None:
+        self.stats.push(value)
+        self.histogram.push(value)
+        self.sketch.push(value)
+
+    def extend(self, values) -> None:
+        """
+
+        :param values: sequence or array of values
+        :return:
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.stats.extend(values)
+        self.histogram.extend(values)
+        self.sketch.extend(values)
+
+    def merge(self, other: "ResultAggregate") -> "ResultAggregate":
+        """
+
+        :param other: aggregate built with the same histogram bins and accuracy
+        :return: self
+        """
+        self.stats.merge(other.stats)
+        self.histogram.merge(other.histogram)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def empty(self) -> "ResultAggregate":
+        """
+
+        :return: new aggregate with the same bins and accuracy and no values, for a worker
+            to fill and merge back
+        """
+        edges = self.histogram.edges
+        return ResultAggregate(edges[0], edges[-1], len(self.histogram.counts),
+                               self.sketch.accuracy)
+
+    def summary(self, qs=(0.05, 0.25, 0.5, 0.75, 0.95)) -> dict:
+        """
+
+        :param qs: quantiles to estimate
+        :return: dict with count, mean, stddev, min, max and the quantile estimates
+        """
+        stats = self.stats
+        return {"count": stats.count, "mean": stats.mean, "stddev": stats.stddev,
+                "min": stats.min, "max": stats.max, "quantiles": self.sketch.quantiles(qs)}
@@ -0,0 +1,373 @@
+"""
+Betting strategies that advance many independent sessions in lockstep.
+
+A strategy keeps the state of every session in NumPy arrays: each spin it gives the
+stake of every session at once and is told which sessions won. simulate plays the
+same even-money style bet for all sessions against one wheel, so comparing
+strategies over a million sessions is a handful of array operations per spin.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+import batch
+import sampling
+
+
+class Strategy:
+    """
+    Betting system for a number of sessions held in arrays
+
+    sessions: number of sessions
+    base: smallest stake, every stake is a whole multiple of it
+    STATE: names of the per-session arrays, indexed by session along their first axis
+    """
+    sessions: int
+    base: float
+
+    STATE = ()
+
+    def __init__(self, sessions: int, base: float = 5) -> None:
+        """
+
+        :param sessions: number of sessions to track
+        :param base: smallest stake
+        """
+        self.sessions = sessions
+        self.base = base
+
+    def stakes(self) -> np.ndarray:
+        """
+
+        :return: float array with the stake of every session for the next spin
+        """
+        raise NotImplementedError
+
+    def update(self, won: np.ndarray, active: np.ndarray = None) -> None:
+        """
+
+        :param won: boolean array, True for the sessions whose bet won the last spin
+        :param active: optional boolean array of the sessions that bet; others keep their state
+        :return:
+        """
+        raise NotImplementedError
+
+    def keep(self, rows: np.ndarray) -> None:
+        """
+        Drops every session not in rows, so later spins only do work for the rest
+
+        :param rows: indices of the sessions to keep, in their new order
+        :return:
+        """
+        for name in self.STATE:
+            setattr(self, name, getattr(self, name)[rows])
+        self.sessions = len(rows)
+
+    @staticmethod
+    def _where(active: np.ndarray, new: np.ndarray, old: np.ndarray) -> np.ndarray:
+        return new if active is None else np.where(active, new, old)
+
+
+class Flat(Strategy):
+    """
+    Always bets the base stake, like Passenger57
+    """
+    def stakes(self) -> np.ndarray:
+        return np.full(self.sessions, float(self.base))
+
+    def update(self, won: np.ndarray, active: np.ndarray = None) -> None:
+        pass
+
+
+class Martingale(Strategy):
+    """
+    Doubles the stake after each loss and goes back to the base stake after a win
+    """
+    STATE = ("losses",)
+
+    def __init__(self, sessions: int, base: float = 5) -> None:
+        super().__init__(sessions, base)
+        self.losses = np.zeros(sessions, dtype=np.int64)
+
+    def stakes(self) -> np.ndarray:
+        return self.base * np.exp2(self.losses)
+
+    def update(self, won: np.ndarray, active: np.ndarray = None) -> None:
+        self.losses = self._where(active, np.where(won, 0, self.losses + 1), self.losses)
+
+
+class Fibonacci(Strategy):
+    """
+    Stakes follow the Fibonacci sequence: one step up after a loss, two steps down after a win
+    """
+    STATE = ("step",)
+
+    def __init__(self, sessions: int, base: float = 5) -> None:
+        super().__init__(sessions, base)
+        self.step = np.zeros(sessions, dtype=np.int64)
+        self._sequence = np.array([1.0, 1.0])
+
+    def stakes(self) -> np.ndarray:
+        top = int(self.step.max(initial=0))
+        while len(self._sequence) <= top:
+            self._sequence = np.append(self._sequence, self._sequence[-1] + self._sequence[-2])
+        return self.base * self._sequence[self.step]
+
+    def update(self, won: np.ndarray, active: np.ndarray = None) -> None:
+        new = np.where(won, np.maximum(self.step - 2, 0), self.step + 1)
+        self.step = self._where(active, new, self.step)
+
+
+class Cancellation(Strategy):
+    """
+    Labouchere cancellation: bet the sum of the first and last numbers of a list, cross both
+    off after a win and add the stake to the end after a loss. The list starts again once
+    it is empty.
+
+    Every session's list is a row of a 2-D array read between a head and a tail column, with
+    the first and last numbers also kept in their own arrays so stakes need no 2-D lookups.
+    """
+    START = (1, 2, 3, 4, 5, 6)
+    STATE = ("numbers", "head", "tail", "first", "last")
+
+    def __init__(self, sessions: int, base: float = 5) -> None:
+        super().__init__(sessions, base)
+        self.numbers = np.zeros((sessions, 4 * len(self.START)), dtype=np.int32)
+        self.head = np.zeros(sessions, dtype=np.int64)
+        self.tail = np.zeros(sessions, dtype=np.int64)
+        self.first = np.zeros(sessions, dtype=np.int32)
+        self.last = np.zeros(sessions, dtype=np.int32)
+        self._restart(np.arange(sessions))
+
+    def _restart(self, rows: np.ndarray) -> None:
+        self.numbers[rows, :len(self.START)] = self.START
+        self.head[rows] = 0
+        self.tail[rows] = len(self.START) - 1
+        self.first[rows] = self.START[0]
+        self.last[rows] = self.START[-1]
+
+    def _units(self) -> np.ndarray:
+        return np.where(self.head == self.tail, self.first, self.first + self.last)
+
+    def stakes(self) -> np.ndarray:
+        return self.base * self._units().astype(np.float64)
+
+    def update(self, won: np.ndarray, active: np.ndarray = None) -> None:
+        units = self._units()
+        winners = won if active is None else active & won
+        losers = ~won if active is None else active & ~won
+
+        rows = np.flatnonzero(winners)
+        self.head[rows] += 1
+        self.tail[rows] -= 1
+        empty = self.head[rows] > self.tail[rows]
+        self._restart(rows[empty])
+        rows = rows[~empty]
+        self.first[rows] = self.numbers[rows, self.head[rows]]
+        self.last[rows] = self.numbers[rows, self.tail[rows]]
+
+        rows = np.flatnonzero(losers)
+        if len(rows):
+            if int(self.tail[rows].max()) + 1 >= self.numbers.shape[1]:
+                self._compact()
+            self.tail[rows] += 1
+            self.numbers[rows, self.tail[rows]] = units[rows]
+            self.last[rows] = units[rows]
+
+    def _compact(self) -> None:
+        """
+        Moves every list to the start of its row, widening the rows if the longest list
+        would not have room to grow
+        """
+        width = self.numbers.shape[1]
+        longest = int((self.tail - self.head).max()) + 2
+        if longest > width // 2:
+            width *= 2
+        columns = np.minimum(self.head[:, None] + np.arange(width), self.numbers.shape[1] - 1)
+        numbers = np.take_along_axis(self.numbers, columns, axis=1)
+        self.tail -= self.head
+        self.head[:] = 0
+        numbers[np.arange(width) > self.tail[:, None]] = 0
+        self.numbers = numbers
+
+
+class OneThreeTwoSix(Strategy):
+    """
+    1-3-2-6 system: after each win move to the next of 1, 3, 2, 6 units, start over after a
+    loss or after the fourth win
+    """
+    UNITS = np.array([1.0, 3.0, 2.0, 6.0])
+    STATE = ("step",)
+
+    def __init__(self, sessions: int, base: float = 5) -> None:
+        super().__init__(sessions, base)
+        self.step = np.zeros(sessions, dtype=np.int64)
+
+    def stakes(self) -> np.ndarray:
+        return self.base * self.UNITS[self.step]
+
+    def update(self, won: np.ndarray, active: np.ndarray = None) -> None:
+        new = np.where(won, (self.step + 1) % len(self.UNITS), 0)
+        self.step = self._where(active, new, self.step)
+
+
+STRATEGIES = {
+    "flat": Flat,
+    "martingale": Martingale,
+    "fibonacci": Fibonacci,
+    "cancellation": Cancellation,
+    "1-3-2-6": OneThreeTwoSix,
+}
+
+
+def outcomeHits(wheel, outcome) -> np.ndarray:
+    """
+
+    :param wheel: built Wheel
+    :param outcome: Outcome on that wheel
+    :return: boolean array, True for each bin containing the outcome
+    """
+    matrix, columns = batch.membershipMatrix(wheel)
+    return matrix[:, columns[outcome]]
+
+
+def simulate(strategy: Strategy, wheel, spins: int, outcome, bankroll: float = 0,
+             seed=None, schedule: str = "uniform") -> np.ndarray:
+    """
+    Plays spins for every session of the strategy, each session spinning its own wheel
+
+    :param strategy: strategy whose sessions are played
+    :param wheel: built Wheel giving the layout
+    :param spins: spins per session
+    :param outcome: Outcome every session bets on
+    :param bankroll: starting bankroll of every session
+    :param seed: seed for the NumPy generator drawing the bins
+    :param schedule: name of a sampling.SCHEDULES entry; "stratified" and "antithetic"
+        couple the sessions to lower the variance of their mean without biasing it
+    :return: float array with the final bankroll of every session
+    """
+    rng = np.random.default_rng(seed)
+    hits = outcomeHits(wheel, outcome)
+    draw = sampling.SCHEDULES[schedule](hits, rng).draw
+    odds = outcome.odds
+    bankrolls = np.full(strategy.sessions, float(bankroll))
+    for _ in range(spins):
+        stakes = strategy.stakes()
+        won = hits[draw(strategy.sessions)]
+        bankrolls += np.where(won, stakes * odds, -stakes)
+        strategy.update(won)
+    return bankrolls
+
+
+@dataclass
+class BankrollResult:
+    """
+    How each session of a bankroll simulation ended
+
+    lengths: spins played by each session
+    finals: final bankroll of each session
+    reasons: why each session stopped, one of the BankrollResult constants
+    """
+    lengths: np.ndarray
+    finals: np.ndarray
+    reasons: np.ndarray
+
+    BROKE = 1
+    TARGET = 2
+    LIMIT = 3
+    SPINS = 4
+
+    def lengthDistribution(self) -> np.ndarray:
+        """
+
+        :return: array where entry n is the fraction of sessions that lasted n spins
+        """
+        return np.bincount(self.lengths) / len(self.lengths)
+
+    def finalQuantiles(self, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)) -> dict:
+        """
+
+        :param quantiles: quantiles to report
+        :return: dict of quantile to final bankroll
+        """
+        return dict(zip(quantiles, np.quantile(self.finals, quantiles)))
+
+    def reasonCounts(self) -> dict:
+        """
+
+        :return: dict of stop reason name to number of sessions
+        """
+        names = {self.BROKE: "broke", self.TARGET: "target", self.LIMIT: "limit",
+                 self.SPINS: "spins"}
+        counts = np.bincount(self.reasons, minlength=len(names) + 1)
+        return {name: int(counts[code]) for code, name in names.items()}
+
+
+def simulateBankroll(strategy: Strategy, wheel, outcome, bankroll, target=None,
+                     spins: int = 1000, limit: float = None, seed=None) -> BankrollResult:
+    """
+    Plays every session of the strategy until it stops. A session stops when it cannot
+    cover its next stake, when its bankroll reaches its target, when its next stake is over
+    the table limit, or after the given number of spins. Finished sessions are dropped from
+    the strategy and the working arrays, so each spin only costs as much as the sessions
+    still playing.
+
+    :param strategy: strategy whose sessions are played; it is left holding only the
+        sessions that ran out of spins
+    :param wheel: built Wheel giving the layout
+    :param outcome: Outcome every session bets on
+    :param bankroll: starting bankroll, a number or an array with one per session
+    :param target: bankroll at which a session stops as a winner, a number or an array;
+        None for no target
+    :param spins: most spins any session plays
+    :param limit: largest stake allowed, usually Table.limit; None for no limit
+    :param seed: seed for the NumPy generator drawing the bins
+    :return: BankrollResult with the length, final bankroll and stop reason of every session
+    """
+    rng = np.random.default_rng(seed)
+    hits = outcomeHits(wheel, outcome)
+    odds = outcome.odds
+    sessions = strategy.sessions
+    money = np.broadcast_to(np.asarray(bankroll, dtype=np.float64), sessions).copy()
+    goal = np.broadcast_to(np.asarray(np.inf if target is None else target, dtype=np.float64),
+                           sessions).copy()
+    result = BankrollResult(np.zeros(sessions, dtype=np.int64), money.copy(),
+                            np.zeros(sessions, dtype=np.int8))
+    live = np.arange(sessions)
+
+    def finish(done: np.ndarray, reason: int) -> None:
+        nonlocal live, money, goal
+        rows = live[done]
+        result.finals[rows] = money[done]
+        result.reasons[rows] = reason
+        keep = np.flatnonzero(~done)
+        live, money, goal = live[keep], money[keep], goal[keep]
+        strategy.keep(keep)
+
+    finish(money >= goal, BankrollResult.TARGET)
+    for _ in range(spins):
+        if not len(live):
+            break
+        stakes = strategy.stakes()
+        if limit is not None:
+            over = stakes > limit
+            if over.any():
+                finish(over, BankrollResult.LIMIT)
+                stakes = stakes[~over]
+        broke = stakes > money
+        if broke.any():
+            finish(broke, BankrollResult.BROKE)
+            stakes = stakes[~broke]
+        if not len(live):
+            break
+        won = hits[rng.integers(0, len(hits), len(live))]
+        money += np.where(won, stakes * odds, -stakes)
+        result.lengths[live] += 1
+        strategy.update(won)
+        reached = money >= goal
+        if reached.any():
+            finish(reached, BankrollResult.TARGET)
+    result.finals[live] = money
+    result.reasons[live] = BankrollResult.SPINS
+    return result
@@ -0,0 +1,35 @@
+from roulette import *
+from adaptive import AdaptiveSimulation, estimateTable
+from unittest import TestCase
+
+
+class TestAdaptive(TestCase):
+    def test_simulation_stops(self):
+        wheel = americanWheel()
+        wheel.rng.seed(4)
+        simulation = AdaptiveSimulation(wheel, Passenger57(Table(), wheel))
+        result = simulation.run(0.5, min_spins=200, check=100)
+        self.assertTrue(result.converged)
+        self.assertEqual(result.spins % 100, 0)
+        self.assertEqual(result.spins, simulation.game.spins)
+        self.assertLessEqual(result.halfWidth, 0.5)
+        # $5 on Black loses 5/19 of a dollar per spin on average
+        self.assertLess(abs(result.mean + 5 / 19), 3 * result.halfWidth)
+        self.assertEqual(len(simulation.player.table.bets), 0)
+
+    def test_simulation_spin_limit(self):
+        wheel = americanWheel()
+        simulation = AdaptiveSimulation(wheel, Passenger57(Table(), wheel))
+        result = simulation.run(1e-6, max_spins=500)
+        self.assertFalse(result.converged)
+        self.assertEqual(result.spins, 500)
+        self.assertIn("spin limit", str(result))
+
+    def test_estimate_table(self):
+        wheel = americanWheel()
+        wheel.rng.seed(9)
+        table = Table(Bet(10, wheel.getOutcome("Red")), Bet(1, wheel.getOutcome("17")))
+        result = estimateTable(wheel, table, 0.05, block=10000)
+        self.assertTrue(result.converged)
+        self.assertEqual(result.spins % 10000, 0)
+        self.assertLess(abs(result.mean + 11 / 19), 3 * result.halfWidth)
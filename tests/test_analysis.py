@@ -0,0 +1,65 @@
+from roulette import *
+from analysis import TableEvaluator
+from fractions import Fraction
+from unittest import TestCase
+import itertools
+
+
+class TestTableEvaluator(TestCase):
+    def setUp(self):
+        self.wheel = Wheel()
+        BinBuilder(self.wheel).buildbins()
+
+    def test_black(self):
+        evaluator = TableEvaluator(Table(Bet(5, self.wheel.getOutcome("Black"))), self.wheel)
+        self.assertEqual(evaluator.distribution(), {-5: Fraction(20, 38), 5: Fraction(18, 38)})
+        self.assertEqual(evaluator.expectedValue(), Fraction(-5, 19))
+        self.assertEqual(evaluator.variance(), 25 - Fraction(5, 19) ** 2)
+
+    def test_session_distribution(self):
+        table = Table(Bet(2, self.wheel.getOutcome("17")),
+                      Bet(3, self.wheel.getOutcome("Dozen 2")),
+                      Bet(0.5, self.wheel.getOutcome("Red")))
+        evaluator = TableEvaluator(table, self.wheel)
+        single = evaluator.distribution()
+        expected = {}
+        for combo in itertools.product(single.items(), repeat=3):
+            total = sum(v for v, p in combo)
+            expected[total] = expected.get(total, 0) + combo[0][1] * combo[1][1] * combo[2][1]
+        values, probabilities = evaluator.sessionDistribution(3)
+        self.assertAlmostEqual(probabilities.sum(), 1)
+        found = {Fraction(v).limit_denominator(8): p for v, p in zip(values, probabilities) if p > 1e-12}
+        self.assertEqual(set(found), set(expected))
+        for total, p in expected.items():
+            self.assertAlmostEqual(found[total], float(p))
+        self.assertAlmostEqual((values * probabilities).sum(), float(3 * evaluator.expectedValue()))
+
+    def test_no_bets(self):
+        evaluator = TableEvaluator(Table(), self.wheel)
+        self.assertEqual(evaluator.distribution(), {0: 1})
+        values, probabilities = evaluator.sessionDistribution(10)
+        self.assertEqual(list(values), [0.0])
+        self.assertEqual(list(probabilities), [1.0])
+
+    def test_decimal_amounts(self):
+        bets = [Bet(0.1, self.wheel.getOutcome("Red")), Bet(0.2, self.wheel.getOutcome("17"))]
+        evaluator = TableEvaluator(bets, self.wheel)
+        self.assertEqual(evaluator.expectedValue(), -Fraction(3, 10) / 19)
+        values, probabilities = evaluator.sessionDistribution(50)
+        self.assertAlmostEqual(probabilities.sum(), 1)
+        self.assertLess(len(values), 10000)
+        self.assertAlmostEqual((values * probabilities).sum(), float(50 * evaluator.expectedValue()))
+
+    def test_table_stays_exact(self):
+        table = Table(Bet(Fraction(1, 3), self.wheel.getOutcome("Red")))
+        table.payouts(self.wheel)
+        for bets in (table, list(table)):
+            self.assertEqual(TableEvaluator(bets, self.wheel).expectedValue(), Fraction(-1, 57))
+
+    def test_fine_lattice_falls_back(self):
+        evaluator = TableEvaluator([Bet(1, self.wheel.getOutcome("Red"))], self.wheel)
+        evaluator.nets = tuple(Fraction(0.1) if n % 2 else Fraction(0.3) for n in range(38))
+        values, probabilities = evaluator.sessionDistribution(20)
+        self.assertEqual(len(values), 21)
+        self.assertAlmostEqual(probabilities.sum(), 1)
+        self.assertAlmostEqual(values[0], 20 * 0.1)
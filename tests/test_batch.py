@@ -0,0 +1,58 @@
+from roulette import *
+from unittest import TestCase
+import batch
+
+
+class RecordingPlayer:
+    """
+    Player that keeps the bets already on the table and records the net of every spin
+    """
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        self.nets = []
+
+    def placeBets(self) -> None:
+        self.nets.append(0)
+
+    def win(self, bet: Bet) -> None:
+        self.nets[-1] += bet.winAmount() - bet.loseAmount()
+
+    def lose(self, bet: Bet) -> None:
+        self.nets[-1] -= bet.loseAmount()
+
+
+class TestBatch(TestCase):
+    def setUp(self):
+        self.wheel = Wheel()
+        BinBuilder(self.wheel).buildbins()
+        self.table = Table(Bet(5, self.wheel.getOutcome("Black")),
+                           Bet(2, self.wheel.getOutcome("17")),
+                           Bet(3, self.wheel.getOutcome("1-2-4-5")),
+                           Bet(1, self.wheel.getOutcome("Dozen 2")))
+        self.game = Game(self.table, self.wheel)
+
+    def test_membership_matrix(self):
+        matrix, columns = batch.membershipMatrix(self.wheel)
+        self.assertEqual(matrix.shape, (38, len(self.wheel.all_outcomes)))
+        self.assertTrue(matrix[5, columns[Outcome("1-2-4-5", 8)]])
+        self.assertFalse(matrix[6, columns[Outcome("1-2-4-5", 8)]])
+        self.assertTrue(matrix[37, columns[Outcome("00", 35)]])
+
+    def test_bin_payouts(self):
+        payouts = batch.binPayouts(self.wheel, self.table)
+        self.assertEqual(payouts[17], 5 + 70 - 3 + 2)
+        self.assertEqual(payouts[0], -11)
+
+    def test_matches_cycle(self):
+        player = RecordingPlayer(self.table)
+        self.wheel.rng.seed(42)
+        for _ in range(500):
+            self.game.cycle(player)
+        self.wheel.rng.seed(42)
+        nets = self.game.runBatch(500)
+        self.assertEqual(list(nets), player.nets)
+
+    def test_unknown_outcome_loses(self):
+        table = Table(Bet(4, Outcome("Nowhere", 3)))
+        payouts = batch.binPayouts(self.wheel, table)
+        self.assertTrue((payouts == -4).all())
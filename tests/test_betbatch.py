@@ -0,0 +1,108 @@
+from roulette import *
+from unittest import TestCase
+
+
+class BatchPlayer:
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        self.nets = []
+        self.bets = []
+
+    def placeBets(self) -> None:
+        pass
+
+    def win(self, bet: Bet) -> None:
+        self.bets.append(bet.winAmount() - bet.loseAmount())
+
+    def lose(self, bet: Bet) -> None:
+        self.bets.append(-bet.loseAmount())
+
+    def settleBatch(self, batch: BetBatch, net: float) -> None:
+        self.nets.append(net)
+
+
+class TestSlots(TestCase):
+    def test_no_instance_dict(self):
+        o = Outcome("Red", 1)
+        b = Bet(5, o)
+        self.assertFalse(hasattr(o, "__dict__"))
+        self.assertFalse(hasattr(b, "__dict__"))
+        with self.assertRaises(AttributeError):
+            b.extra = 1
+
+
+class TestBetBatch(TestCase):
+    def setUp(self):
+        self.wheel = Wheel()
+        BinBuilder(self.wheel).buildbins()
+        names = ["Black", "Red", "17", "Dozen 2", "1-2-4-5", "Black"]
+        self.outcomes = [self.wheel.getOutcome(name) for name in names]
+        self.amounts = [5, 3, 1, 2, 4, 6]
+
+    def test_settle_matches_bets(self):
+        batch = BetBatch(self.wheel, self.amounts, self.outcomes)
+        self.assertEqual(len(batch), 6)
+        bets = list(batch)
+        self.assertEqual(bets[2].outcome, Outcome("17", 35))
+        for wbin in self.wheel.bins:
+            expected = sum(b.winAmount() - b.loseAmount() if wbin.hasOutcome(b.outcome)
+                           else -b.loseAmount() for b in bets)
+            self.assertEqual(batch.settle(wbin), expected)
+
+    def test_add_invalidates_totals(self):
+        batch = BetBatch(self.wheel)
+        batch.add(5, self.wheel.getOutcome("Black"))
+        self.assertEqual(batch.totals(), {self.wheel.getOutcome("Black").id: 5})
+        batch.extendIds([2], [self.wheel.getOutcome("Black").id])
+        self.assertEqual(batch.totals(), {self.wheel.getOutcome("Black").id: 7})
+        with self.assertRaises(ValueError):
+            batch.extendIds([1, 2], [0])
+
+    def test_batch_bets_format(self):
+        batch = BetBatch(self.wheel, [5, 2.5], self.outcomes[:2])
+        whole, half = list(batch)
+        self.assertEqual(str(whole), "$5 on Black (1:1)")
+        self.assertEqual(repr(whole), "Bet(amount=5, outcome=Outcome(name='Black', odds=1))")
+        self.assertEqual(str(half), "$2.5 on Red (1:1)")
+        self.assertEqual(repr(half), "Bet(amount=2.5, outcome=Outcome(name='Red', odds=1))")
+
+    def test_bin_from_other_wheel(self):
+        european = layoutWheel(EUROPEAN)
+        batch = BetBatch(european, [5], [european.getOutcome("Black")])
+        with self.assertRaises(ValueError):
+            batch.settle(self.wheel.get(2))
+        table = Table()
+        table.placeBatch(batch)
+        with self.assertRaises(ValueError):
+            table.payouts(self.wheel)
+        player = BatchPlayer(table)
+        with self.assertRaises(ValueError):
+            Game(table, self.wheel).cycle(player)
+        self.assertEqual(batch.settle(european.share().get(2)), 5)
+
+    def test_table_and_game(self):
+        table = Table(Bet(1, self.wheel.getOutcome("0")))
+        batch = BetBatch(self.wheel, self.amounts, self.outcomes)
+        table.placeBatch(batch)
+        self.assertEqual(table.total, 22)
+        table.limit = 100
+        table.minimum = 2
+        with self.assertRaises(InvalidBet):
+            table.isValid()
+        table.minimum = 1
+        table.isValid()
+
+        player = BatchPlayer(table)
+        game = Game(table, self.wheel, instrument=True)
+        self.wheel.rng.seed(6)
+        for _ in range(10):
+            game.cycle(player)
+        self.wheel.rng.seed(6)
+        expected = [batch.settle(self.wheel.choose()) for _ in range(10)]
+        self.assertEqual(player.nets, expected)
+        self.assertEqual(len(player.bets), 10)
+        self.assertEqual(game.instrumentation.bets, 70)
+
+        game.seat(player)
+        game.cycle()
+        self.assertEqual(len(player.nets), 11)
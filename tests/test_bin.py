@@ -1,4 +1,6 @@
 from roulette import *
+import os
+import tempfile
 from unittest import TestCase
 
 class TestBin(TestCase):
@@ -17,3 +19,120 @@ class TestBin(TestCase):
         self.assertSetEqual(b1.union(b2),b3)
         self.assertTrue(b1.isdisjoint(b5))
         self.assertTrue(b1.issubset(b3) and b2.issubset(b3) and b4.issubset(b3) and b5.issubset(b3))
+
+    def test_bin_mask(self):
+        wheel = Wheel()
+        o1 = Outcome("Red", 1)
+        o2 = Outcome("Black", 1)
+        o3 = Outcome("Red", 4)
+        wheel.addOutcome(1, o1)
+        wheel.addOutcome(1, o3)
+        wheel.addOutcome(2, o2)
+        wheel.addOutcome(3, o1)
+        self.assertEqual((o1.id, o2.id, o3.id), (0, 2, 1))
+        self.assertEqual(wheel.get(1).mask, 0b011)
+        self.assertEqual(wheel.get(2).mask, 0b100)
+        self.assertEqual(wheel.get(3).mask, 0b001)
+        self.assertTrue(wheel.get(1).hasOutcome(o3))
+        self.assertFalse(wheel.get(2).hasOutcome(o1))
+        self.assertTrue(wheel.get(3).hasOutcome(Outcome("Red", 1)))
+        self.assertFalse(wheel.get(3).hasOutcome(Outcome("Red", 4)))
+
+    def test_packed_masks(self):
+        wheel = Wheel()
+        BinBuilder(wheel).buildbins()
+        packed = wheel.packedMasks()
+        width = (len(wheel.outcomes_by_id) + 7) // 8
+        self.assertEqual(len(packed), 38 * width)
+        self.assertLess(len(packed), 1024)
+        for i, b in enumerate(wheel.bins):
+            self.assertEqual(int.from_bytes(packed[i*width:(i+1)*width], "little"), b.mask)
+            self.assertSetEqual(set(b.outcomes), {wheel.outcomes_by_id[n] for n in range(len(wheel.outcomes_by_id)) if b.mask >> n & 1})
+
+
+class TestOutcomeOnTwoWheels(TestCase):
+    def test_shared_outcome(self):
+        o = Outcome("Shared", 2)
+        w1, w2 = Wheel(), Wheel()
+        w1.addOutcome(1, Outcome("Filler", 1))
+        w1.addOutcome(3, o)
+        w2.addOutcome(3, o)
+        w2.addOutcome(4, Outcome("Other", 1))
+        for wheel in (w1, w2):
+            self.assertTrue(wheel.get(3).hasOutcome(o))
+            self.assertFalse(wheel.get(4).hasOutcome(o))
+            self.assertFalse(wheel.get(1).hasOutcome(o))
+
+    def test_shared_layout_keeps_its_ids(self):
+        american = americanWheel()
+        black = american.getOutcome("Black")
+        oid = black.id
+        Wheel().addOutcome(0, black)
+        self.assertIs(black.id_space, american.id_space)
+        self.assertEqual(black.id, oid)
+        self.assertEqual(american.outcome_ids[black], oid)
+
+    def test_outcome_from_other_layout(self):
+        american, european = americanWheel(), layoutWheel(EUROPEAN)
+        black = american.getOutcome("Black")
+        self.assertNotEqual(black.id, european.getOutcome("Black").id)
+        for n in range(37):
+            wbin = european.get(n)
+            self.assertEqual(wbin.hasOutcome(black), black in wbin.outcomes)
+        self.assertTrue(european.get(2).hasOutcome(black))
+
+    def test_grouped_settlement_across_wheels(self):
+        american, european = americanWheel(), layoutWheel(EUROPEAN)
+        # different outcomes that share an id on their own wheels
+        mine = american.outcomes_by_id[40]
+        theirs = european.outcomes_by_id[40]
+        self.assertNotEqual(mine, theirs)
+        settled = {}
+
+        class Player:
+            def __init__(self, table):
+                self.table = table
+
+            def placeBets(self):
+                pass
+
+            def settle(self, wins, losses):
+                settled.update({bet.outcome.name: True for bet in wins})
+                settled.update({bet.outcome.name: False for bet in losses})
+
+        game = Game(Table(), american)
+        game.seat(Player(Table(Bet(1, mine))))
+        game.seat(Player(Table(Bet(1, theirs))))
+        wbin = game.resolve()
+        self.assertEqual(settled, {mine.name: wbin.hasOutcome(mine),
+                                   theirs.name: wbin.hasOutcome(theirs)})
+
+
+class TestBinMembership(TestCase):
+    def wheels(self):
+        built = Wheel()
+        BinBuilder(built).buildbins()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "layout.pkl")
+            built.saveLayout(path)
+            loaded = Wheel.loadLayout(path)
+        return [built, loaded, Wheel.fromLayout(AMERICAN), americanWheel()]
+
+    def test_same_membership_on_every_path(self):
+        black = Outcome("Black", 1)
+        for wheel in self.wheels():
+            wbin = wheel.get(2)
+            self.assertFalse(black in wbin)
+            self.assertEqual(len(wbin), 0)
+            self.assertIn(black, wbin.outcomes)
+            self.assertTrue(wbin.hasOutcome(black))
+
+    def test_add_outcome_to_layout_bin(self):
+        wheel = Wheel.fromLayout(AMERICAN)
+        extra = Outcome("Extra", 5)
+        wheel.addOutcome(2, extra)
+        wbin = wheel.get(2)
+        self.assertIn(extra, wbin.outcomes)
+        self.assertIn(Outcome("Black", 1), wbin.outcomes)
+        self.assertTrue(wbin.hasOutcome(extra))
+        self.assertFalse(extra in wbin)
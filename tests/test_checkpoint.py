@@ -0,0 +1,66 @@
+from roulette import *
+from checkpoint import Simulation
+from rng import BlockRandom
+from unittest import TestCase
+import os
+import tempfile
+
+
+class MartingalePlayer(Passenger57):
+    """
+    Passenger57 with state of its own that must survive a checkpoint
+    """
+    def __init__(self, table: Table, wheel: Wheel) -> None:
+        super().__init__(table, wheel)
+        self.stake = 1
+        self.history = []
+
+    def placeBets(self) -> None:
+        self.table.placeBet(Bet(self.stake, self.black))
+
+    def win(self, bet: Bet) -> None:
+        self.stake = 1
+        self.history.append(bet.amountBet)
+
+    def lose(self, bet: Bet) -> None:
+        self.stake = min(self.stake * 2, 64)
+        self.history.append(-bet.amountBet)
+
+
+class TestCheckpoint(TestCase):
+    def play(self, rng=None):
+        wheel = americanWheel(rng=rng)
+        wheel.rng.seed(12)
+        return wheel, Simulation(wheel, MartingalePlayer(Table(), wheel))
+
+    def totals(self, simulation):
+        stats = simulation.stats
+        return (simulation.game.spins, stats.events, stats.net, stats.bins,
+                simulation.player.history, simulation.game.wheel.rng.getstate())
+
+    def check_resume(self, rng_factory):
+        wheel, full = self.play(rng_factory())
+        full.run(300)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sim.ckpt")
+            wheel, first = self.play(rng_factory())
+            first.run(120, path)
+            resumed = Simulation.resume(path, americanWheel(rng=rng_factory()))
+            resumed.run(300, path, interval=0)
+            self.assertEqual(os.listdir(tmp), ["sim.ckpt"])
+        self.assertEqual(self.totals(resumed), self.totals(full))
+        self.assertIs(resumed.player.black, resumed.game.wheel.getOutcome("Black"))
+
+    def test_resume_random(self):
+        self.check_resume(lambda: None)
+
+    def test_resume_block_random(self):
+        self.check_resume(lambda: BlockRandom(block=50))
+
+    def test_snapshot_round_trip(self):
+        wheel, simulation = self.play()
+        simulation.run(10)
+        data = simulation.snapshot()
+        self.assertLess(len(data), 8192)
+        copy = Simulation.restore(data, americanWheel())
+        self.assertEqual(self.totals(copy), self.totals(simulation))
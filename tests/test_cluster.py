@@ -0,0 +1,89 @@
+from roulette import *
+from unittest import TestCase
+from multiprocessing import Pipe
+from multiprocessing.connection import Client
+import cluster
+import runner
+import threading
+
+
+def serial(spins, shard, seed):
+    wheel = Wheel()
+    BinBuilder(wheel).buildbins()
+    total = runner.SessionStats()
+    for index, (start, stop) in enumerate(cluster.shardBounds(spins, shard)):
+        total.merge(cluster.playShard(wheel, seed, index, start, stop))
+    return total
+
+
+class BrokenSend:
+    """
+    Connection whose worker is gone by the time a shard is sent to it
+    """
+    def __init__(self, conn):
+        self.conn = conn
+
+    def fileno(self):
+        return self.conn.fileno()
+
+    def recv(self):
+        return self.conn.recv()
+
+    def send(self, message):
+        raise BrokenPipeError
+
+    def close(self):
+        self.conn.close()
+
+
+class TestCluster(TestCase):
+    def test_shard_bounds(self):
+        self.assertEqual(cluster.shardBounds(10, 4), [(0, 4), (4, 8), (8, 10)])
+        self.assertEqual(cluster.shardBounds(0, 4), [])
+
+    def test_play_shard_progress(self):
+        wheel = americanWheel()
+        seen = []
+        stats = cluster.playShard(wheel, 1, 0, 100, 350, 100, lambda s: seen.append(s.spins))
+        self.assertEqual(seen, [100, 200])
+        self.assertEqual((stats.sessions, stats.spins), (1, 250))
+        self.assertEqual(stats.wins + stats.losses, 250)
+
+    def test_local_workers(self):
+        coordinator = cluster.Coordinator(3000, 3, shard=700)
+        self.assertEqual(coordinator.run(workers=2), serial(3000, 700, 3))
+        self.assertEqual(coordinator.reassigned, 0)
+
+    def test_dead_worker_shard_reassigned(self):
+        coordinator = cluster.Coordinator(2000, 8, shard=500)
+        result = []
+        thread = threading.Thread(target=lambda: result.append(coordinator.run()))
+        thread.start()
+        with Client(coordinator.address, authkey=coordinator.authkey) as conn:
+            conn.send(("hello", 0))
+            kind, index, start, stop, seed = conn.recv()
+            self.assertEqual((kind, index, start, stop, seed), ("shard", 0, 0, 500, 8))
+        worker = threading.Thread(target=cluster.work,
+                                  args=(coordinator.address, coordinator.authkey, 100))
+        worker.start()
+        thread.join(60)
+        worker.join(60)
+        self.assertEqual(coordinator.reassigned, 1)
+        self.assertEqual(result, [serial(2000, 500, 8)])
+
+    def test_worker_gone_before_send(self):
+        coordinator = cluster.Coordinator(1500, 4, shard=500)
+        ours, theirs = Pipe()
+        theirs.send(("hello", 0))
+        coordinator._joined.put(BrokenSend(ours))
+        result = []
+        thread = threading.Thread(target=lambda: result.append(coordinator.run()))
+        thread.start()
+        worker = threading.Thread(target=cluster.work,
+                                  args=(coordinator.address, coordinator.authkey, 100))
+        worker.start()
+        thread.join(60)
+        worker.join(60)
+        theirs.close()
+        self.assertEqual(result, [serial(1500, 500, 4)])
+        self.assertEqual(coordinator.reassigned, 0)
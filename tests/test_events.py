@@ -0,0 +1,82 @@
+from roulette import *
+from events import *
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+import os
+import tempfile
+
+
+class TestEvents(TestCase):
+    def setUp(self):
+        self.wheel = Wheel()
+        BinBuilder(self.wheel).buildbins()
+        self.table = Table()
+        self.player = Passenger57(self.table, self.wheel)
+
+    def play(self, sink, spins=3):
+        game = Game(self.table, self.wheel, sink)
+        self.wheel.rng.seed(1)
+        for _ in range(spins):
+            game.cycle(self.player)
+        return game
+
+    def test_null_sink_is_silent(self):
+        stdout = StringIO()
+        with patch('sys.stdout', new=stdout):
+            game = self.play(None)
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(game.spins, 3)
+
+    def test_aggregating_sink(self):
+        sink = AggregatingSink()
+        self.play(sink)
+        # Passenger57 keeps adding a bet, so 1 + 2 + 3 bets are settled
+        self.assertEqual(sink.events, 6)
+        self.assertEqual(sink.wins + sink.losses, 6)
+        self.assertEqual(sink.wagered, 30)
+        self.assertEqual(sink.net, 5 * sink.wins - 5 * sink.losses)
+        self.assertEqual(sum(sink.bins.values()), 3)
+
+    def test_console_sink(self):
+        stdout = StringIO()
+        with patch('sys.stdout', new=stdout):
+            self.play(ConsoleSink(), spins=1)
+        self.assertRegex(stdout.getvalue(),
+                         r"^\$5 on Black \(1:1\) is a (winner! You win \$10|loser. You lose \$5)\n$")
+
+    def test_buffered_file_sink(self):
+        aggregate = AggregatingSink()
+        self.play(aggregate)
+        self.table.clear()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.bin")
+            with BufferedFileSink(path, chunk=64) as sink:
+                self.play(sink)
+            self.assertEqual(os.path.getsize(path), 6 * BufferedFileSink.RECORD.size)
+            records = list(readEvents(path, chunk=100))
+        black = self.wheel.getOutcome("Black")
+        self.assertEqual([r[0] for r in records], [0, 1, 1, 2, 2, 2])
+        self.assertTrue(all(r[2] == black.id and r[4] == 5 for r in records))
+        self.assertEqual(sum(r[5] for r in records), aggregate.net)
+        for spin, wbin, oid, won, amount, payout in records:
+            self.assertEqual(won, self.wheel.get(wbin).hasOutcome(black))
+
+    def test_file_sink_ids_from_game_wheel(self):
+        black = Outcome("Black", 1)
+        other = Wheel()
+        other.addOutcome(0, Outcome("Filler", 1))
+        other.addOutcome(1, black)
+        self.wheel.addOutcome(2, black)
+        self.player = Passenger57(self.table, self.wheel)
+        self.assertIs(self.player.black, black)
+        self.assertNotEqual(black.id, self.wheel.outcome_ids[black])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.bin")
+            with BufferedFileSink(path) as sink:
+                game = self.play(sink, spins=2)
+                game.seat(self.player)
+                game.cycle()
+            records = list(readEvents(path))
+        self.assertEqual(len(records), 6)
+        self.assertTrue(all(r[2] == self.wheel.outcome_ids[black] for r in records))
@@ -0,0 +1,152 @@
+from roulette import *
+from events import AggregatingSink
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        self.wheel = Wheel()
+        BinBuilder(self.wheel).buildbins()
+        self.table = Table()
+        self.player = Passenger57(self.table, self.wheel)
+
+    def test_disabled_by_default(self):
+        with patch.dict('os.environ', {}, clear=True):
+            game = Game(self.table, self.wheel)
+        self.assertIsNone(game.instrumentation)
+        game.cycle(self.player)
+
+    def test_flag(self):
+        game = Game(self.table, self.wheel, instrument=True)
+        for _ in range(4):
+            game.cycle(self.player)
+        stats = game.instrumentation.asDict()
+        self.assertEqual(stats["bets"], 1 + 2 + 3 + 4)
+        for phase in Instrumentation.PHASES:
+            self.assertEqual(stats["phases"][phase]["calls"], 4)
+            self.assertGreaterEqual(stats["phases"][phase]["seconds"], 0)
+        report = game.instrumentation.report()
+        self.assertIn("settle", report)
+        self.assertIn("bets settled: 10", report)
+
+    def test_environment(self):
+        with patch.dict('os.environ', {"ROULETTE_INSTRUMENT": "1"}):
+            self.assertIsNotNone(Game(self.table, self.wheel).instrumentation)
+            self.assertIsNone(Game(self.table, self.wheel, instrument=False).instrumentation)
+        with patch.dict('os.environ', {"ROULETTE_INSTRUMENT": "0"}):
+            self.assertIsNone(Game(self.table, self.wheel).instrumentation)
+
+    def test_same_results(self):
+        results = []
+        for instrument in (False, True):
+            self.table.clear()
+            sink = AggregatingSink()
+            game = Game(self.table, self.wheel, sink, instrument=instrument)
+            self.wheel.rng.seed(9)
+            for _ in range(5):
+                game.cycle(self.player)
+            results.append((sink.net, sink.bins))
+        self.assertEqual(results[0], results[1])
+
+
+class BulkPlayer:
+    """
+    Player with fixed bets that records what it is told about each spin
+    """
+    def __init__(self, *bets) -> None:
+        self.table = Table(*bets)
+        self.results = []
+
+    def placeBets(self) -> None:
+        pass
+
+    def win(self, bet: Bet) -> None:
+        self.results.append(("win", bet))
+
+    def lose(self, bet: Bet) -> None:
+        self.results.append(("lose", bet))
+
+
+class SettlingPlayer(BulkPlayer):
+    def settle(self, wins: list, losses: list) -> None:
+        self.results.append((list(wins), list(losses)))
+
+
+class TestMultiPlayer(TestCase):
+    def setUp(self):
+        self.wheel = Wheel()
+        BinBuilder(self.wheel).buildbins()
+        self.game = Game(Table(), self.wheel)
+
+    def test_grouped_matches_single(self):
+        outcomes = [self.wheel.getOutcome(name) for name in ("Black", "Red", "17", "Dozen 2")]
+        players = [BulkPlayer(*(Bet(n + 1, outcomes[(n + i) % 4]) for n in range(6)))
+                   for i in range(5)]
+        for p in players:
+            self.game.seat(p)
+        self.wheel.rng.seed(4)
+        for _ in range(20):
+            self.game.cycle()
+        grouped = [sorted(p.results, key=lambda r: id(r[1])) for p in players]
+
+        for p in players:
+            p.results.clear()
+        self.wheel.rng.seed(4)
+        for _ in range(20):
+            wbin = self.wheel.choose()
+            for p in players:
+                self.game._settle((p,), wbin)
+        single = [sorted(p.results, key=lambda r: id(r[1])) for p in players]
+        self.assertEqual(grouped, single)
+
+    def test_bulk_settle(self):
+        black = self.wheel.getOutcome("Black")
+        red = self.wheel.getOutcome("Red")
+        b1, b2, b3 = Bet(1, black), Bet(2, red), Bet(3, black)
+        p1 = SettlingPlayer(b1, b2)
+        p2 = SettlingPlayer(b3, Bet(4, Outcome("Nowhere", 1)))
+        self.game.seat(p1)
+        self.game.seat(p2)
+        self.wheel.rng = Mock(choice=Mock(return_value=self.wheel.get(17)))
+        sink = AggregatingSink()
+        self.game.sink = sink
+        self.game.cycle()
+        self.assertEqual(p1.results, [([b1], [b2])])
+        self.assertEqual(p2.results[0][0], [b3])
+        self.assertEqual(len(p2.results[0][1]), 1)
+        self.assertEqual(sink.events, 4)
+        self.assertEqual(sink.net, 1 - 2 + 3 - 4)
+        self.assertEqual(self.game.spins, 1)
+
+
+class NetPlayer(Passenger57):
+    def __init__(self, table, wheel):
+        super().__init__(table, wheel)
+        self.nets = []
+
+    def settleNet(self, net):
+        self.nets.append(net)
+
+
+class TestCycleNet(TestCase):
+    def test_matches_bet_by_bet(self):
+        wheel = americanWheel()
+        events = AggregatingSink()
+        table = Table(Bet(1, wheel.getOutcome("0")))
+        player = NetPlayer(table, wheel)
+        wheel.rng.seed(21)
+        expected = []
+        game = Game(table, wheel, events)
+        for _ in range(40):
+            before = events.net
+            game.cycle(player)
+            expected.append(events.net - before)
+        wheel.rng.seed(21)
+        table = Table(Bet(1, wheel.getOutcome("0")))
+        player = NetPlayer(table, wheel)
+        game = Game(table, wheel)
+        nets = [game.cycleNet(player) for _ in range(40)]
+        self.assertEqual(nets, expected)
+        self.assertEqual(player.nets, expected)
+        self.assertEqual(game.spins, 40)
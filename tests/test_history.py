@@ -0,0 +1,100 @@
+from roulette import *
+from history import HistorySink, SpinHistory, SpinHistoryWriter
+from unittest import TestCase
+import batch
+import numpy as np
+import os
+import tempfile
+
+
+class TestSpinHistory(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "spins.hist")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_bins_only(self):
+        rng = np.random.default_rng(0)
+        bins = rng.integers(0, 38, 10000)
+        with SpinHistoryWriter(self.path, buffer=1000) as writer:
+            writer.extend(bins[:5000])
+            for b in bins[5000:5010]:
+                writer.append(int(b))
+        with SpinHistoryWriter(self.path, buffer=333) as writer:
+            writer.extend(bins[5010:])
+        self.assertEqual(os.path.getsize(self.path), 16 + 10000)
+        history = SpinHistory(self.path)
+        self.assertEqual(len(history), 10000)
+        self.assertTrue(np.array_equal(history.bins, bins))
+        part, nets = history.range(100, 200)
+        self.assertIsNone(nets)
+        self.assertTrue(np.shares_memory(part, history.records))
+        stats = history.stats(chunk=777)
+        self.assertTrue(np.array_equal(stats["counts"], np.bincount(bins, minlength=38)))
+        self.assertNotIn("net", stats)
+
+    def test_with_net(self):
+        wheel = americanWheel()
+        table = Table(Bet(5, wheel.getOutcome("Black")), Bet(1, wheel.getOutcome("0")))
+        wheel.rng.seed(3)
+        indices = batch.drawIndices(wheel, 5000)
+        nets = batch.binPayouts(wheel, table)[indices]
+        with SpinHistoryWriter(self.path, with_net=True, buffer=512) as writer:
+            writer.extend(indices, nets)
+        with self.assertRaises(ValueError):
+            SpinHistoryWriter(self.path, with_net=False)
+        history = SpinHistory(self.path)
+        self.assertEqual(os.path.getsize(self.path), 16 + 9 * 5000)
+        self.assertTrue(np.array_equal(history.nets, nets))
+        stats = history.stats(1000, 4000, chunk=100)
+        self.assertEqual(stats["spins"], 3000)
+        self.assertAlmostEqual(stats["net"], nets[1000:4000].sum())
+        self.assertEqual(stats["min"], nets[1000:4000].min())
+        self.assertEqual(stats["counts"].sum(), 3000)
+
+    def test_history_sink(self):
+        wheel = americanWheel()
+        table = Table()
+        player = Passenger57(table, wheel)
+        sink = HistorySink(SpinHistoryWriter(self.path, with_net=True))
+        game = Game(table, wheel, sink)
+        wheel.rng.seed(5)
+        for _ in range(20):
+            game.cycle(player)
+            table.clear()
+        sink.close()
+        history = SpinHistory(self.path)
+        self.assertEqual(len(history), 20)
+        black = wheel.getOutcome("Black")
+        for b, net in zip(history.bins, history.nets):
+            self.assertEqual(net, 5 if wheel.get(b).hasOutcome(black) else -5)
+
+    def test_spins_without_bets(self):
+        wheel = americanWheel()
+        table = Table()
+        player = Passenger57(table, wheel)
+        sink = HistorySink(SpinHistoryWriter(self.path, with_net=True))
+        game = Game(table, wheel, sink)
+        wheel.rng.seed(9)
+        state = wheel.rng.getstate()
+        for spin in range(10):
+            if spin % 2:
+                game.cycle(player)
+                table.clear()
+            else:
+                game.resolve([])
+        sink.close()
+        history = SpinHistory(self.path)
+        self.assertEqual(len(history), 10)
+        wheel.rng.setstate(state)
+        self.assertEqual(list(history.bins), [wheel.choose().index for _ in range(10)])
+        self.assertEqual([float(n) for n in history.nets[0::2]], [0.0] * 5)
+        self.assertTrue(all(abs(n) == 5 for n in history.nets[1::2]))
+
+    def test_empty(self):
+        SpinHistoryWriter(self.path).close()
+        history = SpinHistory(self.path)
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.stats()["spins"], 0)
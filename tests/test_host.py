@@ -0,0 +1,93 @@
+from roulette import *
+from host import AsyncGameHost, LocalPlayer
+from unittest import TestCase
+import asyncio
+
+
+class TestAsyncGameHost(TestCase):
+    def build(self, tables, host, slow_delay=None):
+        players = []
+        for i in range(tables):
+            wheel = americanWheel()
+            wheel.rng.seed(i)
+            game = Game(Table(), wheel)
+            for delay in (0.0, 0.001):
+                player = LocalPlayer(Table(), wheel, delay)
+                game.seat(player)
+                players.append(player)
+            if slow_delay is not None:
+                slow = LocalPlayer(Table(), wheel, slow_delay)
+                game.seat(slow)
+                players.append(slow)
+            host.addTable(game)
+        return players
+
+    def test_many_tables(self):
+        host = AsyncGameHost(timeout=1.0, queue_size=4)
+        players = self.build(50, host)
+        received = []
+
+        async def consumer(event):
+            await asyncio.sleep(0)
+            received.append(event)
+
+        stats = asyncio.run(host.run(6, consumers=[consumer, consumer]))
+        self.assertEqual(len(stats), 50)
+        self.assertTrue(all(s.spins == 6 and s.bets == 12 and s.timeouts == 0 for s in stats))
+        self.assertEqual(len(received), 50 * 12)
+        self.assertEqual(sum(p.net for p in players), sum(s.net for s in stats))
+        self.assertEqual(sum(e.payout for e in received), sum(s.net for s in stats))
+
+    def test_timeouts(self):
+        host = AsyncGameHost(timeout=0.01)
+        players = self.build(3, host, slow_delay=0.5)
+        stats = asyncio.run(host.run(2))
+        for s in stats:
+            self.assertEqual((s.timeouts, s.errors), (2, 0))
+            self.assertEqual(s.bets, 4)
+        slow = players[2::3]
+        self.assertTrue(all(p.net == 0 and len(p.table.bets) == 0 for p in slow))
+
+    def test_sync_players(self):
+        host = AsyncGameHost()
+        wheel = americanWheel()
+        game = Game(Table(), wheel)
+        game.seat(Passenger57(Table(), wheel))
+        host.addTable(game)
+        stats = asyncio.run(host.run(3))
+        self.assertEqual((stats[0].spins, stats[0].bets), (3, 3))
+
+    def test_failing_consumer(self):
+        host = AsyncGameHost(queue_size=2)
+        self.build(4, host)
+        received = []
+
+        def consumer(event):
+            received.append(event)
+            if len(received) == 3:
+                raise RuntimeError("consumer failed")
+
+        async def run():
+            return await asyncio.wait_for(host.run(10, consumers=[consumer]), 5)
+
+        with self.assertRaisesRegex(RuntimeError, "consumer failed"):
+            asyncio.run(run())
+        self.assertEqual(len(received), 3)
+
+    def test_failing_player(self):
+        class FailingPlayer(LocalPlayer):
+            async def placeBets(self):
+                self.table.placeBet(Bet(self.amount, self.outcome))
+                raise ConnectionError("player went away")
+
+        host = AsyncGameHost()
+        players = self.build(2, host)
+        for game in host.games:
+            failing = FailingPlayer(Table(), game.wheel)
+            game.seat(failing)
+            players.append(failing)
+        stats = asyncio.run(host.run(3))
+        for s in stats:
+            self.assertEqual((s.spins, s.bets, s.timeouts, s.errors), (3, 6, 0, 3))
+            self.assertIsInstance(s.last_error, ConnectionError)
+        self.assertTrue(all(p.net == 0 and len(p.table.bets) == 0 for p in players[4:]))
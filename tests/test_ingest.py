@@ -0,0 +1,76 @@
+from roulette import *
+from ingest import loadBets, outcomeIndex, resolveNames
+from unittest import TestCase
+import json
+import os
+import tempfile
+
+
+class TestIngest(TestCase):
+    def setUp(self):
+        self.wheel = americanWheel()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.rows = [(5, "Black"), (2.5, "1-2-4-5"), (1, "Dozen 2"), (3, "Purple"),
+                     (4, "00"), (1, "Purple"), (7, "Black")] * 10
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def check(self, report):
+        self.assertEqual(report.lines, 70)
+        self.assertEqual(report.loaded, 50)
+        self.assertEqual(dict(report.unknown), {"Purple": 20})
+        expected = [(a, n) for a, n in self.rows if n != "Purple"]
+        loaded = [(b.amountBet, b.outcome.name) for b in report.batch]
+        self.assertEqual(loaded, expected)
+
+    def test_csv(self):
+        text = "amount,outcome\n" + "".join(f"{a},{n}\n" for a, n in self.rows)
+        self.check(loadBets(self.write("bets.csv", text), self.wheel, chunk=8))
+
+    def test_csv_without_header(self):
+        text = "".join(f"{a},{n}\n" for a, n in self.rows)
+        self.check(loadBets(self.write("bets.txt", text), self.wheel, fmt="csv"))
+
+    def test_jsonl_into_table(self):
+        text = "".join(json.dumps({"amount": a, "outcome": n}) + "\n" for a, n in self.rows)
+        table = Table()
+        report = loadBets(self.write("bets.jsonl", text), self.wheel, table, chunk=3)
+        self.check(report)
+        self.assertEqual(table.batches, [report.batch])
+        self.assertEqual(table.total, sum(a for a, n in self.rows if n != "Purple"))
+
+    def test_resolve_names(self):
+        index = outcomeIndex(self.wheel)
+        ids = resolveNames(index, ["Red", "Nope", "Red", "17"])
+        red = self.wheel.outcome_ids[self.wheel.getOutcome("Red")]
+        self.assertEqual(list(ids), [red, -1, red,
+                                     self.wheel.outcome_ids[self.wheel.getOutcome("17")]])
+
+    def test_index_ignores_other_wheels(self):
+        red = Outcome("Red", 1)
+        other = Wheel()
+        other.addOutcome(0, Outcome("Filler", 1))
+        other.addOutcome(1, red)
+        wheel = Wheel()
+        BinBuilder(wheel).buildbins()
+        wheel.addOutcome(1, red)
+        self.assertNotEqual(red.id, wheel.outcome_ids[red])
+        self.assertEqual(outcomeIndex(wheel)["Red"], wheel.outcome_ids[red])
+        report = loadBets(self.write("red.csv", "5,Red\n"), wheel)
+        self.assertEqual([b.outcome for b in report.batch], [red])
+
+    def test_target_batch_for_other_wheel(self):
+        other = Wheel()
+        BinBuilder(other).buildbins()
+        path = self.write("bets.csv", "5,Black\n")
+        with self.assertRaises(ValueError):
+            loadBets(path, self.wheel, BetBatch(other))
+        shared = BetBatch(self.wheel.share())
+        self.assertEqual(loadBets(path, self.wheel, shared).loaded, 1)
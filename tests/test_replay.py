@@ -0,0 +1,135 @@
+from roulette import *
+from events import AggregatingSink
+from replay import BET, HEADER, SPIN, Divergence, SessionRecorder, replay
+from rng import BlockRandom
+from unittest import TestCase
+import os
+import pickle
+import tempfile
+
+
+class SometimesPlayer(Passenger57):
+    """
+    Bets on Black and a split on some spins and nothing on others
+    """
+    def __init__(self, table, wheel):
+        super().__init__(table, wheel)
+        self.split = wheel.getOutcome("1-2")
+        self.turn = 0
+
+    def placeBets(self):
+        self.turn += 1
+        if self.turn % 3:
+            self.table.placeBet(Bet(5, self.black))
+            self.table.placeBet(Bet(2.5, self.split))
+
+
+class TestReplay(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.replay")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record(self, spins, rng=None, seed=3):
+        wheel = americanWheel(rng=rng)
+        wheel.rng.seed(seed)
+        table = Table()
+        player = SometimesPlayer(table, wheel)
+        sink = AggregatingSink()
+        game = Game(table, wheel, sink)
+        with SessionRecorder(self.path, game) as recorder:
+            for _ in range(spins):
+                game.cycle(player)
+                table.clear()
+        self.assertIs(game.sink, sink)
+        return recorder, sink
+
+    def test_identical(self):
+        recorder, sink = self.record(500)
+        # every third spin has no bets and leaves an empty record
+        self.assertEqual(sink.events, 2 * 334)
+        self.assertEqual(recorder.spins, 500)
+        report = replay(self.path)
+        self.assertIsNone(report.divergence)
+        self.assertEqual(report.spins, 500)
+        self.assertIn("all identical", str(report))
+
+    def test_trailing_spins_without_bets(self):
+        wheel = americanWheel()
+        wheel.rng.seed(5)
+        table = Table()
+        player = SometimesPlayer(table, wheel)
+        game = Game(table, wheel)
+        with SessionRecorder(self.path, game) as recorder:
+            for _ in range(20):
+                game.cycle(player)
+                table.clear()
+            # the player stops betting, these spins only turn the wheel
+            player.placeBets = lambda: None
+            for _ in range(7):
+                game.cycle(player)
+        self.assertEqual(recorder.spins, 27)
+        report = replay(self.path)
+        self.assertEqual(report.spins, 27)
+        self.assertIsNone(report.divergence)
+
+    def test_block_random(self):
+        self.record(300, BlockRandom(block=64), seed=8)
+        self.assertLess(os.path.getsize(self.path), 4096 + 300 * (11 + 2 * 10))
+        self.assertIsNone(replay(self.path).divergence)
+
+    def test_payout_divergence(self):
+        self.record(100)
+        wheel = Wheel.fromLayout(AMERICAN)
+        wheel.getOutcome("1-2").odds = 16
+        report = replay(self.path, wheel)
+        divergence = report.divergence
+        self.assertEqual(divergence.field, "net")
+        self.assertEqual(divergence.actual - divergence.expected, -2.5)
+        self.assertEqual(report.spins, divergence.spin + 1)
+
+    def test_bin_divergence(self):
+        self.record(50)
+        with open(self.path, "r+b") as f:
+            f.seek(HEADER.size)
+            pickle.load(f)
+            start = f.tell()
+            recorded = f.read(1)[0]
+            f.seek(start)
+            f.write(bytes([(recorded + 1) % 38]))
+        report = replay(self.path)
+        self.assertEqual(report.divergence, Divergence(0, "bin", (recorded + 1) % 38, recorded))
+        self.assertEqual(report.spins, 1)
+
+    def test_betless_bin_divergence(self):
+        self.record(30)
+        # spin 2 is the first without bets
+        with open(self.path, "r+b") as f:
+            f.seek(HEADER.size)
+            pickle.load(f)
+            for _ in range(2):
+                count = SPIN.unpack(f.read(SPIN.size))[1]
+                f.seek(count * BET.size, os.SEEK_CUR)
+            start = f.tell()
+            index, count, net = SPIN.unpack(f.read(SPIN.size))
+            self.assertEqual((count, net), (0, 0.0))
+            f.seek(start)
+            f.write(bytes([(index + 1) % 38]))
+        report = replay(self.path)
+        self.assertEqual(report.divergence, Divergence(2, "bin", (index + 1) % 38, index))
+
+    def test_wheel_left_unfrozen(self):
+        self.record(10)
+        wheel = Wheel.fromLayout(AMERICAN)
+        rng = wheel.rng
+        self.assertIsNone(replay(self.path, wheel).divergence)
+        self.assertFalse(wheel.frozen)
+        self.assertIs(wheel.rng, rng)
+        wheel.addOutcome(0, Outcome("Extra", 5))
+
+    def test_missing_outcome(self):
+        self.record(10)
+        with self.assertRaises(ValueError):
+            replay(self.path, Wheel.fromLayout(EUROPEAN))
@@ -0,0 +1,50 @@
+from roulette import *
+from rng import BlockRandom
+from unittest import TestCase
+import batch
+
+
+class TestBlockRandom(TestCase):
+    def test_seed_reproducible(self):
+        wheel = Wheel(BlockRandom(block=16))
+        BinBuilder(wheel).buildbins()
+        wheel.rng.seed(1)
+        first = [wheel.choose().index for _ in range(50)]
+        wheel.rng.seed(1)
+        second = [wheel.choose().index for _ in range(50)]
+        self.assertEqual(first, second)
+        self.assertTrue(all(0 <= i < 38 for i in first))
+        self.assertGreater(len(set(first)), 10)
+
+    def test_block_size_does_not_matter(self):
+        small = BlockRandom(5, block=7)
+        large = BlockRandom(5, block=64)
+        a = [small.index(38) for _ in range(100)]
+        b = [large.index(38) for _ in range(100)]
+        self.assertEqual(a, b)
+
+    def test_index_matches_indices(self):
+        one = BlockRandom(5, block=7)
+        many = BlockRandom(5, block=7)
+        a = [one.index(38) for _ in range(30)]
+        self.assertEqual(a, list(many.indices(38, 30)))
+
+    def test_state_snapshot(self):
+        source = BlockRandom(3, block=10)
+        snapshot = source.getstate()
+        start = [source.index(38) for _ in range(25)]
+        source.setstate(snapshot)
+        self.assertEqual([source.index(38) for _ in range(25)], start)
+        middle = source.getstate()
+        rest = [source.index(38) for _ in range(17)]
+        source.setstate(middle)
+        self.assertEqual([source.index(38) for _ in range(17)], rest)
+
+    def test_batch_matches_cycle(self):
+        wheel = americanWheel(rng=BlockRandom(block=64))
+        table = Table(Bet(5, wheel.getOutcome("Black")), Bet(1, wheel.getOutcome("0")))
+        game = Game(table, wheel)
+        wheel.rng.seed(8)
+        expected = batch.binPayouts(wheel, table)[[wheel.choose().index for _ in range(200)]]
+        wheel.rng.seed(8)
+        self.assertEqual(list(game.runBatch(200)), list(expected))
@@ -0,0 +1,33 @@
+from roulette import *
+from unittest import TestCase
+import runner
+
+
+class TestRunner(TestCase):
+    def test_session_seed(self):
+        self.assertEqual(runner.sessionSeed(7, 3), runner.sessionSeed(7, 3))
+        self.assertNotEqual(runner.sessionSeed(7, 3), runner.sessionSeed(7, 4))
+        self.assertNotEqual(runner.sessionSeed(7, 3), runner.sessionSeed(8, 3))
+
+    def test_play_sessions(self):
+        wheel = Wheel()
+        BinBuilder(wheel).buildbins()
+        stats = runner.playSessions(wheel, 11, 0, 4, 25)
+        self.assertEqual(stats.sessions, 4)
+        self.assertEqual(stats.spins, 100)
+        self.assertEqual(stats.wins + stats.losses, 100)
+        self.assertEqual(stats.net, 5 * stats.wins - 5 * stats.losses)
+
+    def test_worker_count_independent(self):
+        wheel = Wheel()
+        BinBuilder(wheel).buildbins()
+        serial = runner.playSessions(wheel, 5, 0, 12, 20)
+        one = runner.runSessions(12, 20, 5, workers=1)
+        three = runner.runSessions(12, 20, 5, workers=3, chunk=5)
+        self.assertEqual(serial, one)
+        self.assertEqual(serial, three)
+
+    def test_merge(self):
+        a = runner.SessionStats(1, 10, 4, 6, -10)
+        b = runner.SessionStats(2, 20, 11, 9, 10)
+        self.assertEqual(a.merge(b), runner.SessionStats(3, 30, 15, 15, 0))
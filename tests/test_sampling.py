@@ -0,0 +1,54 @@
+from roulette import *
+from unittest import TestCase
+import numpy as np
+import sampling
+import strategies
+
+
+class TestSchedules(TestCase):
+    def setUp(self):
+        self.wheel = americanWheel()
+        self.black = self.wheel.getOutcome("Black")
+        self.hits = strategies.outcomeHits(self.wheel, self.black)
+
+    def test_marginals_uniform(self):
+        for name, schedule in sampling.SCHEDULES.items():
+            draw = schedule(self.hits, np.random.default_rng(2)).draw
+            draws = np.array([draw(101) for _ in range(2000)])
+            for session in (0, 1, 100):
+                counts = np.bincount(draws[:, session], minlength=38)
+                # chi-square with 37 degrees of freedom, far beyond its 0.999 quantile
+                chi2 = ((counts - 2000 / 38) ** 2 / (2000 / 38)).sum()
+                self.assertLess(chi2, 80, name)
+
+    def test_stratified_balanced(self):
+        draw = sampling.StratifiedSchedule(self.hits, np.random.default_rng(0)).draw
+        counts = np.bincount(draw(38 * 5 + 7), minlength=38)
+        self.assertTrue(set(counts) <= {5, 6})
+
+    def test_antithetic_pairs(self):
+        draw = sampling.AntitheticSchedule(self.hits, np.random.default_rng(0)).draw
+        bins = draw(1001)
+        won = self.hits[bins]
+        self.assertEqual(len(bins), 1001)
+        # a winning bin always pairs with a losing one
+        self.assertFalse((won[0:1000:2] & won[1::2]).any())
+
+    def test_simulate_uniform_unchanged(self):
+        rng = np.random.default_rng(5)
+        expected = np.where(self.hits[rng.integers(0, 38, 10)], 5.0, -5.0)
+        finals = strategies.simulate(strategies.Flat(10), self.wheel, 1, self.black, seed=5)
+        self.assertTrue(np.array_equal(finals, expected))
+
+    def test_compare_schedules(self):
+        reports = sampling.compareSchedules(strategies.Flat, self.wheel, 10,
+                                            self.black, 380, replicates=20, seed=1)
+        self.assertEqual([r.name for r in reports], ["uniform", "stratified", "antithetic"])
+        self.assertEqual(reports[0].efficiency, 1)
+        for report in reports:
+            self.assertEqual(report.spins, 3800)
+            self.assertIn("efficiency", str(report))
+        # every spin deals 10 whole wheels, so flat betting comes out exact
+        self.assertAlmostEqual(reports[1].variance, 0)
+        self.assertLess(reports[1].spinsForUniformPrecision, 1)
+        self.assertGreater(reports[2].efficiency, 2)
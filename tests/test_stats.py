@@ -0,0 +1,104 @@
+from roulette import *
+from stats import Histogram, QuantileSketch, ResultAggregate, RunningStats, zScore
+from unittest import TestCase
+import numpy as np
+
+
+class TestRunningStats(TestCase):
+    def setUp(self):
+        self.values = np.random.default_rng(1).normal(3, 2, 5000)
+
+    def test_push(self):
+        stats = RunningStats()
+        for v in self.values:
+            stats.push(v)
+        self.assertEqual(stats.count, 5000)
+        self.assertAlmostEqual(stats.mean, self.values.mean())
+        self.assertAlmostEqual(stats.variance, self.values.var(ddof=1))
+
+    def test_extend_and_merge(self):
+        first, second = RunningStats(), RunningStats()
+        first.extend(self.values[:1234])
+        second.extend(list(self.values[1234:]))
+        first.merge(second).merge(RunningStats())
+        self.assertEqual(first.count, 5000)
+        self.assertAlmostEqual(first.mean, self.values.mean())
+        self.assertAlmostEqual(first.variance, self.values.var(ddof=1))
+
+    def test_interval(self):
+        stats = RunningStats()
+        self.assertEqual(stats.halfWidth(), float("inf"))
+        stats.extend(self.values)
+        low, high = stats.interval(0.95)
+        self.assertAlmostEqual(high - low, 2 * 1.959964 * stats.stddev / np.sqrt(5000), 5)
+        self.assertAlmostEqual(zScore(0.95), 1.959964, 5)
+        with self.assertRaises(ValueError):
+            zScore(1)
+
+    def test_range(self):
+        stats = RunningStats()
+        stats.extend(self.values[:10])
+        stats.push(100)
+        other = RunningStats()
+        other.extend(list(self.values[10:20]))
+        stats.merge(other)
+        self.assertEqual(stats.max, 100)
+        self.assertEqual(stats.min, self.values[:20].min())
+
+
+class TestHistogram(TestCase):
+    def test_counts_and_merge(self):
+        values = np.random.default_rng(3).normal(0, 10, 10000)
+        first, second = Histogram(-20, 20, 16), Histogram(-20, 20, 16)
+        first.extend(values[:4000])
+        for v in values[4000:4100]:
+            second.push(v)
+        second.extend(values[4100:])
+        first.merge(second)
+        inside = values[(values >= -20) & (values <= 20)]
+        self.assertTrue(np.array_equal(first.counts, np.histogram(inside, first.edges)[0]))
+        self.assertEqual(first.underflow, (values < -20).sum())
+        self.assertEqual(first.overflow, (values > 20).sum())
+        self.assertEqual(first.total, 10000)
+        with self.assertRaises(ValueError):
+            first.merge(Histogram(-20, 20, 8))
+
+
+class TestQuantileSketch(TestCase):
+    def test_relative_accuracy(self):
+        values = np.concatenate([np.random.default_rng(4).lognormal(3, 2, 20000),
+                                 -np.random.default_rng(5).lognormal(1, 1, 5000),
+                                 np.zeros(1000)])
+        parts = [QuantileSketch(0.01) for _ in range(3)]
+        for part, chunk in zip(parts, np.array_split(np.random.default_rng(6).permutation(values), 3)):
+            part.extend(chunk)
+        sketch = parts[0].merge(parts[1]).merge(parts[2])
+        self.assertEqual(sketch.count, len(values))
+        ordered = np.sort(values)
+        for q in (0, 0.01, 0.1, 0.2, 0.22, 0.5, 0.9, 0.99, 1):
+            exact = ordered[int(q * (len(values) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(q) - exact), 0.0101 * abs(exact) + 1e-12)
+        self.assertLessEqual(len(sketch.positive), sketch.max_buckets)
+
+    def test_bucket_limit(self):
+        sketch = QuantileSketch(0.01, max_buckets=50)
+        sketch.extend(np.geomspace(1e-3, 1e6, 10000))
+        self.assertEqual(len(sketch.positive), 50)
+        self.assertAlmostEqual(sketch.quantile(1), 1e6, delta=1e4)
+        self.assertTrue(np.isnan(QuantileSketch().quantile(0.5)))
+
+
+class TestResultAggregate(TestCase):
+    def test_runner_sessions(self):
+        import runner
+        aggregate = ResultAggregate(-100, 100, 40)
+        parallel = runner.runSessions(12, 20, 5, workers=2, chunk=5, aggregate=aggregate)
+        serial = ResultAggregate(-100, 100, 40)
+        wheel = americanWheel()
+        runner.playSessions(wheel, 5, 0, 12, 20, serial)
+        self.assertEqual(parallel, runner.playSessions(wheel, 5, 0, 12, 20))
+        self.assertEqual(aggregate.stats.count, 12)
+        self.assertAlmostEqual(aggregate.stats.mean * 12, parallel.net)
+        self.assertTrue(np.array_equal(aggregate.histogram.counts, serial.histogram.counts))
+        self.assertEqual(aggregate.summary()["quantiles"], serial.summary()["quantiles"])
+        self.assertAlmostEqual(aggregate.stats.variance, serial.stats.variance)
@@ -0,0 +1,132 @@
+from roulette import *
+from unittest import TestCase
+import numpy as np
+import strategies
+
+
+def martingale(results, base):
+    stake, out = base, []
+    for won in results:
+        out.append(stake)
+        stake = base if won else stake * 2
+    return out
+
+
+def fibonacci(results, base):
+    fib, step, out = [1, 1], 0, []
+    for won in results:
+        while len(fib) <= step:
+            fib.append(fib[-1] + fib[-2])
+        out.append(base * fib[step])
+        step = max(step - 2, 0) if won else step + 1
+    return out
+
+
+def cancellation(results, base):
+    numbers, out = [1, 2, 3, 4, 5, 6], []
+    for won in results:
+        stake = numbers[0] if len(numbers) == 1 else numbers[0] + numbers[-1]
+        out.append(base * stake)
+        if won:
+            numbers = numbers[1:-1] or [1, 2, 3, 4, 5, 6]
+        else:
+            numbers.append(stake)
+    return out
+
+
+def one_three_two_six(results, base):
+    units, step, out = [1, 3, 2, 6], 0, []
+    for won in results:
+        out.append(base * units[step])
+        step = (step + 1) % 4 if won else 0
+    return out
+
+
+class TestStrategies(TestCase):
+    REFERENCES = {
+        strategies.Martingale: martingale,
+        strategies.Fibonacci: fibonacci,
+        strategies.Cancellation: cancellation,
+        strategies.OneThreeTwoSix: one_three_two_six,
+    }
+
+    def test_matches_scalar_reference(self):
+        rng = np.random.default_rng(0)
+        results = rng.random((40, 60)) < 0.47
+        for cls, reference in self.REFERENCES.items():
+            strategy = cls(40, base=5)
+            stakes = []
+            for spin in range(60):
+                stakes.append(strategy.stakes())
+                strategy.update(results[:, spin])
+            stakes = np.array(stakes).T
+            for session in range(40):
+                self.assertEqual(list(stakes[session]), reference(results[session], 5), cls.__name__)
+
+    def test_inactive_sessions_keep_state(self):
+        strategy = strategies.Martingale(3, base=1)
+        lost = np.array([False, False, False])
+        strategy.update(lost, active=np.array([True, False, True]))
+        self.assertEqual(list(strategy.stakes()), [2, 1, 2])
+        cancel = strategies.Cancellation(2, base=1)
+        cancel.update(lost[:2], active=np.array([False, True]))
+        self.assertEqual(list(cancel.stakes()), [7, 8])
+
+    def test_simulate(self):
+        wheel = americanWheel()
+        black = wheel.getOutcome("Black")
+        hits = strategies.outcomeHits(wheel, black)
+        self.assertEqual(hits.sum(), 18)
+        self.assertTrue(hits[17] and not hits[18])
+        flat = strategies.simulate(strategies.Flat(20000), wheel, 10, black, 100, seed=1)
+        self.assertTrue(np.all((flat - 100) % 10 == 0))
+        self.assertAlmostEqual(flat.mean() - 100, 10 * -5 / 19, delta=0.5)
+        again = strategies.simulate(strategies.Flat(20000), wheel, 10, black, 100, seed=1)
+        self.assertTrue(np.array_equal(flat, again))
+
+
+class TestBankroll(TestCase):
+    def setUp(self):
+        self.wheel = americanWheel()
+        self.black = self.wheel.getOutcome("Black")
+
+    def test_keep(self):
+        strategy = strategies.Cancellation(4, base=1)
+        strategy.update(np.array([False, True, False, False]))
+        before = strategy.stakes()
+        strategy.keep(np.array([3, 1]))
+        self.assertEqual(strategy.sessions, 2)
+        self.assertEqual(list(strategy.stakes()), [before[3], before[1]])
+
+    def test_flat_stop_rules(self):
+        result = strategies.simulateBankroll(strategies.Flat(5000), self.wheel, self.black,
+                                             bankroll=20, target=40, spins=50, seed=3)
+        counts = result.reasonCounts()
+        self.assertEqual(sum(counts.values()), 5000)
+        self.assertEqual(counts["limit"], 0)
+        broke = result.reasons == result.BROKE
+        self.assertTrue(np.all(result.finals[broke] == 0))
+        self.assertTrue(np.all(result.finals[result.reasons == result.TARGET] == 40))
+        running = result.reasons == result.SPINS
+        self.assertTrue(np.all(result.lengths[running] == 50))
+        self.assertTrue(np.all((result.finals[running] >= 0) & (result.finals[running] < 40)))
+        self.assertTrue(np.all(result.lengths[broke] >= 4))
+        self.assertAlmostEqual(result.lengthDistribution().sum(), 1)
+        self.assertTrue(np.all(np.diff(list(result.finalQuantiles().values())) >= 0))
+
+    def test_table_limit(self):
+        result = strategies.simulateBankroll(strategies.Martingale(2000, base=1), self.wheel,
+                                             self.black, bankroll=10 ** 6, spins=200,
+                                             limit=64, seed=5)
+        counts = result.reasonCounts()
+        self.assertGreater(counts["limit"], 0)
+        self.assertEqual(counts["broke"], 0)
+        self.assertTrue(np.all(result.lengths[result.reasons == result.LIMIT] >= 7))
+
+    def test_per_session_targets(self):
+        result = strategies.simulateBankroll(strategies.Flat(3, base=1), self.wheel, self.black,
+                                             bankroll=[5, 5, 5], target=[5, 6, 100],
+                                             spins=1000, seed=1)
+        self.assertEqual(result.lengths[0], 0)
+        self.assertEqual(result.reasons[0], result.TARGET)
+        self.assertIn(result.reasons[1], (result.TARGET, result.BROKE))
@@ -0,0 +1,113 @@
+from roulette import *
+from unittest import TestCase
+
+
+class TestTableValidation(TestCase):
+    def setUp(self):
+        self.o1 = Outcome("Five Bet", 5)
+        self.o2 = Outcome("5", 25)
+
+    def test_running_total(self):
+        b1 = Bet(5, self.o1)
+        b2 = Bet(10, self.o2)
+        t = Table(b1)
+        t.limit = 20
+        t.minimum = 1
+        t.placeBets([b2, Bet(3, self.o1)])
+        self.assertEqual(t.total, 18)
+        t.isValid()
+        t.placeBet(Bet(4, self.o2))
+        with self.assertRaises(InvalidBet):
+            t.isValid()
+        t.removeBet(b2)
+        self.assertEqual(t.total, 12)
+        t.isValid()
+
+    def test_minimum_violations(self):
+        low = Bet(1, self.o1)
+        t = Table(Bet(5, self.o1), low)
+        t.limit = 100
+        with self.assertRaises(InvalidBet):
+            t.isValid()
+        t.minimum = 2
+        with self.assertRaises(InvalidBet):
+            t.isValid()
+        t.removeBet(low)
+        t.isValid()
+        t.minimum = 10
+        with self.assertRaises(InvalidBet):
+            t.isValid()
+        t.clear()
+        self.assertEqual(t.total, 0)
+        t.isValid()
+
+    def test_bets_view(self):
+        b1 = Bet(5, self.o1)
+        t = Table(b1)
+        view = t.bets
+        t.placeBet(Bet(1, self.o2))
+        self.assertEqual(len(view), 2)
+        self.assertIs(view[0], b1)
+        self.assertEqual(list(view), list(t))
+        with self.assertRaises(AttributeError):
+            view.append(b1)
+
+
+class TestTablePayouts(TestCase):
+    def setUp(self):
+        self.wheel = americanWheel()
+        self.black = self.wheel.getOutcome("Black")
+        self.zero = self.wheel.getOutcome("0")
+
+    def expected(self, table):
+        return tuple(sum(bet.winAmount() - bet.loseAmount() if wbin.hasOutcome(bet.outcome)
+                         else -bet.loseAmount() for bet in table)
+                     + sum(batch.settle(wbin) for batch in table.batches)
+                     for wbin in self.wheel.bins)
+
+    def test_cached_until_changed(self):
+        bet = Bet(5, self.black)
+        table = Table(bet, Bet(1, self.zero))
+        vector = table.payouts(self.wheel)
+        self.assertEqual(vector, self.expected(table))
+        self.assertIs(table.payouts(self.wheel), vector)
+        self.assertEqual(vector[0], 35 - 5)
+        changes = [lambda: table.placeBet(Bet(2, self.black)),
+                   lambda: table.placeBets([Bet(3, self.wheel.getOutcome("Odd"))]),
+                   lambda: table.removeBet(bet),
+                   lambda: table.placeBatch(BetBatch(self.wheel, [4], [self.zero])),
+                   lambda: table.clear()]
+        for change in changes:
+            before = table.payouts(self.wheel)
+            change()
+            after = table.payouts(self.wheel)
+            self.assertIsNot(after, before)
+            self.assertEqual(after, self.expected(table))
+        self.assertEqual(table.payouts(self.wheel), (0,) * 38)
+
+    def test_other_wheel_recompiled(self):
+        table = Table(Bet(5, self.black))
+        other = americanWheel()
+        self.assertIsNot(table.payouts(other), table.payouts(self.wheel))
+        self.assertEqual(table.payouts(other), table.payouts(self.wheel))
+
+
+class TestTableTotal(TestCase):
+    def test_no_rounding_left_behind(self):
+        o = Outcome("Red", 1)
+        small, smaller = Bet(0.1, o), Bet(0.2, o)
+        t = Table(small, smaller, Bet(5, o))
+        self.assertEqual(t.total, 5.3)
+        t.removeBet(small)
+        t.removeBet(smaller)
+        self.assertEqual(t.total, 5)
+        self.assertIsInstance(t.total, int)
+        t.placeBets([Bet(0.7, o), Bet(0.1, o)])
+        self.assertEqual(t.total, 5.8)
+        t = Table(small, smaller)
+        t.removeBet(small)
+        t.removeBet(smaller)
+        t.limit = 0
+        t.minimum = 0
+        self.assertEqual(t.total, 0)
+        t.isValid()
@@ -0,0 +1,83 @@
+from roulette import *
+from unittest import TestCase
+import os
+import tempfile
+
+
+class TestFrozenWheel(TestCase):
+    def test_freeze(self):
+        wheel = Wheel()
+        BinBuilder(wheel).buildbins()
+        wheel.freeze()
+        with self.assertRaises(FrozenWheel):
+            wheel.addOutcome(1, Outcome("Extra", 1))
+        with self.assertRaises(TypeError):
+            wheel.all_outcomes["Extra"] = Outcome("Extra", 1)
+
+    def test_american_wheel_shares_layout(self):
+        w1 = americanWheel()
+        w2 = americanWheel()
+        self.assertTrue(w1.frozen and w2.frozen)
+        self.assertIs(w1.bins, w2.bins)
+        self.assertIsNot(w1.rng, w2.rng)
+        self.assertIn(Outcome("1-2-4-5", 8), w1.get(5).outcomes)
+        self.assertEqual(Outcome("Black", 1), w2.getOutcome("Black"))
+        w1.rng.seed(3)
+        w2.rng.seed(3)
+        self.assertIs(w1.choose(), w2.choose())
+
+    def test_layout_round_trip(self):
+        wheel = Wheel()
+        BinBuilder(wheel).buildbins()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "american.layout")
+            wheel.saveLayout(path)
+            loaded = Wheel.loadLayout(path)
+            cached = americanWheel(path)
+            self.assertEqual(cached.packedMasks(), wheel.packedMasks())
+        self.assertEqual(loaded.packedMasks(), wheel.packedMasks())
+        self.assertEqual(loaded.outcomes_by_id, wheel.outcomes_by_id)
+        for original, copy in zip(wheel.bins, loaded.bins):
+            self.assertSetEqual(original.outcomes, copy.outcomes)
+        black = loaded.getOutcome("Black")
+        self.assertTrue(loaded.get(17).hasOutcome(black))
+        self.assertFalse(loaded.get(18).hasOutcome(black))
+
+
+class TestLayouts(TestCase):
+    def test_american_matches_binbuilder(self):
+        built = Wheel()
+        BinBuilder(built).buildbins()
+        wheel = Wheel.fromLayout(AMERICAN)
+        self.assertEqual([(o.name, o.odds) for o in wheel.outcomes_by_id],
+                         [(o.name, o.odds) for o in built.outcomes_by_id])
+        for original, copy in zip(built.bins, wheel.bins):
+            self.assertEqual(copy.mask, original.mask)
+            self.assertSetEqual(copy.outcomes, original.outcomes)
+            self.assertEqual(len(copy), len(original))
+        self.assertEqual(wheel.getOutcome("Black").id, built.getOutcome("Black").id)
+
+    def test_european(self):
+        wheel = layoutWheel(EUROPEAN)
+        self.assertEqual(len(wheel.bins), 37)
+        self.assertTrue(wheel.frozen)
+        self.assertIs(layoutWheel(EUROPEAN).bins, wheel.bins)
+        self.assertNotIn("00", wheel.all_outcomes)
+        self.assertNotIn("Five Bet", wheel.all_outcomes)
+        self.assertEqual(len(wheel.get(0).outcomes), 1)
+        self.assertSetEqual({o.name for o in wheel.get(17).outcomes},
+                            {o.name for o in americanWheel().get(17).outcomes})
+        hits = sum(wheel.get(n).hasOutcome(wheel.getOutcome("Red")) for n in range(37))
+        self.assertEqual(hits, 18)
+
+    def test_triple_zero(self):
+        wheel = Wheel.fromLayout(TRIPLE_ZERO)
+        self.assertEqual(len(wheel.bins), 39)
+        self.assertEqual([b.index for b in wheel.bins], list(range(39)))
+        self.assertIn(wheel.getOutcome("000"), wheel.get(38).outcomes)
+        wheel.rng.seed(1)
+        self.assertEqual({wheel.choose().index for _ in range(2000)}, set(range(39)))
+
+    def test_sized_wheel(self):
+        wheel = Wheel(size=37)
+        self.assertEqual(len(wheel.bins), 37)